@@ -0,0 +1,42 @@
+import os
+import secrets
+from typing import Optional
+from fastapi import Depends, Header, HTTPException
+from calendar_agent.utils.ai_summarizer import AISummarizer
+from calendar_agent.utils.event_service import EventService
+from calendar_agent.utils.http_clients import get_http_client, get_openai_client
+from calendar_agent.utils.reminder_tracker import ReminderTracker, reminder_tracker
+from calendar_agent.utils.textbelt_sms import TextBeltSMSClient
+
+_ai_summarizer: Optional[AISummarizer] = None
+
+def get_ai_summarizer() -> AISummarizer:
+    global _ai_summarizer
+    client = get_openai_client()
+    if _ai_summarizer is None or _ai_summarizer.client is not client:
+        _ai_summarizer = AISummarizer(client=client)
+    return _ai_summarizer
+
+def get_event_service() -> EventService:
+    return EventService(client=get_http_client("luma"))
+
+def get_reminder_tracker() -> ReminderTracker:
+    return reminder_tracker
+
+def require_admin_token(authorization: Optional[str] = Header(default=None)):
+    """Bearer SUBSCRIBERS_ADMIN_TOKEN, for endpoints that manage who gets texted"""
+    expected = os.getenv("SUBSCRIBERS_ADMIN_TOKEN")
+    if not expected:
+        # Fail closed: without a configured token nobody can manage subscribers over HTTP
+        raise HTTPException(status_code=503, detail="Subscriber management is not configured")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Invalid or missing admin token")
+
+def get_sms_client(ai_summarizer: AISummarizer = Depends(get_ai_summarizer)) -> TextBeltSMSClient:
+    return TextBeltSMSClient(
+        api_key=os.getenv("TEXTBELT_API_KEY"),
+        to_number=os.getenv("SMS_TO_NUMBER", "+12098128451"),
+        client=get_http_client("textbelt"),
+        ai_summarizer=ai_summarizer
+    )
@@ -1,20 +1,19 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from datetime import datetime
-import os
+from calendar_agent.api.dependencies import get_event_service, get_sms_client
 from calendar_agent.utils.event_service import EventService
+from calendar_agent.utils.fanout import FanoutSender
+from calendar_agent.utils.subscribers import subscriber_registry
 from calendar_agent.utils.textbelt_sms import TextBeltSMSClient
 
 router = APIRouter()
 
 @router.post("/digest")
-async def send_weekly_digest():
+async def send_weekly_digest(
+    event_service: EventService = Depends(get_event_service),
+    sms_client: TextBeltSMSClient = Depends(get_sms_client)
+):
     try:
-        event_service = EventService()
-        sms_client = TextBeltSMSClient(
-            api_key=os.getenv("TEXTBELT_API_KEY"),
-            to_number=os.getenv("SMS_TO_NUMBER", "+12098128451")
-        )
-        
         upcoming_events = await event_service.get_upcoming_events()
         
         if not upcoming_events:
@@ -24,26 +23,30 @@ async def send_weekly_digest():
                 "timestamp": datetime.utcnow().isoformat()
             }
         
-        result = await sms_client.send_weekly_digest(upcoming_events)
+        # Generated once (top 3 events, to fit an SMS) and sent to every subscriber
+        message_generator = await sms_client.ai_summarizer.generate_weekly_digest(upcoming_events[:3])
+        delivery = await FanoutSender(sms_client).deliver(message_generator, subscriber_registry.recipients())
+        sent = [result for result in delivery["results"] if result["status"] == "sent"]
         
-        if result["success"]:
+        if sent:
             return {
                 "status": "success",
                 "events_included": len(upcoming_events),
-                "message_id": result.get("message_id"),
-                "ai_generated": result.get("ai_generated", False),
-                "tokens_used": result.get("tokens_used", 0),
-                "service": result.get("service", "TextBelt"),
-                "quota_remaining": result.get("quota_remaining"),
+                "message_id": sent[0].get("message_id"),
+                "ai_generated": True,
+                "tokens_used": message_generator.tokens_used,
+                "service": "TextBelt",
+                "quota_remaining": delivery["quota_remaining"],
+                "recipients_sent": delivery["sent"],
+                "recipients_failed": delivery["failed"],
+                "elapsed_ms": delivery["elapsed_ms"],
                 "timestamp": datetime.utcnow().isoformat()
             }
         else:
             return {
                 "status": "failed",
-                "error": result.get("error"),
+                "error": next((r.get("error") for r in delivery["results"]), "No subscribers"),
                 "timestamp": datetime.utcnow().isoformat()
             }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        await sms_client.close()
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,42 @@
+import asyncio
+from typing import Any, Dict, Optional
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from calendar_agent.utils import deadline
+from calendar_agent.utils.import_profile import loaded_lazy_packages, profile_imports
+from calendar_agent.utils.metrics import registry
+from calendar_agent.utils.prompt_registry import prompt_registry
+
+router = APIRouter()
+
+# The cold-start profile can't change within a process, so it is run at most once per process
+MAX_IMPORT_ROWS = 100
+_import_report: Optional[Dict[str, Any]] = None
+_import_report_lock = asyncio.Lock()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    # Prometheus text exposition format, version 0.0.4
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@router.get("/metrics/imports")
+async def get_import_times(top: int = 15):
+    """Cold-start import breakdown of the app (a fresh interpreter's -X importtime), plus what this process has loaded"""
+    global _import_report
+    async with _import_report_lock:
+        if _import_report is None:
+            _import_report = await asyncio.to_thread(
+                profile_imports, "calendar_agent.main", MAX_IMPORT_ROWS, deadline.timeout_for(60.0)
+            )
+    top = min(max(top, 1), MAX_IMPORT_ROWS)
+    return {
+        **_import_report,
+        "packages": _import_report["packages"][:top],
+        "slowest_modules": _import_report["slowest_modules"][:top],
+        "loaded_in_this_process": loaded_lazy_packages()
+    }
+
+@router.get("/metrics/prompts")
+async def get_prompt_templates():
+    """Loaded prompt templates with their placeholders and estimated token lengths"""
+    return prompt_registry.report()
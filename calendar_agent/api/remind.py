@@ -1,74 +1,57 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from datetime import datetime, timedelta
-import os
-from calendar_agent.utils.event_service import EventService
+from calendar_agent.api.dependencies import get_event_service, get_reminder_tracker, get_sms_client
+from calendar_agent.utils.ai_summarizer import MessageGenerator
+from calendar_agent.utils.event_service import REMINDER_WINDOWS, EventService
+from calendar_agent.utils.fanout import FanoutSender
+from calendar_agent.utils.http_clients import get_http_client
+from calendar_agent.utils.reminder_dispatch import ReminderDispatcher
+from calendar_agent.utils.reminder_messages import reminder_message_store
+from calendar_agent.utils.reminder_schedule import ReminderSchedule, reminder_schedule_store
+from calendar_agent.utils.reminder_scheduler import send_due_reminders
 from calendar_agent.utils.reminder_tracker import ReminderTracker
+from calendar_agent.utils.subscribers import subscriber_registry
 from calendar_agent.utils.textbelt_sms import TextBeltSMSClient
 
 router = APIRouter()
 
-REMINDER_WINDOWS = [
-    (timedelta(hours=24), "24_hours"),
-    (timedelta(hours=2), "2_hours"),
-    (timedelta(minutes=30), "30_minutes")
-]
-
 @router.post("/remind")
-async def send_reminders():
+async def send_reminders(
+    event_service: EventService = Depends(get_event_service),
+    reminder_tracker: ReminderTracker = Depends(get_reminder_tracker),
+    sms_client: TextBeltSMSClient = Depends(get_sms_client)
+):
     try:
-        event_service = EventService()
-        reminder_tracker = ReminderTracker()
-        sms_client = TextBeltSMSClient(
-            api_key=os.getenv("TEXTBELT_API_KEY"),
-            to_number=os.getenv("SMS_TO_NUMBER", "+12098128451")
-        )
-        
-        reminders_sent = []
-        
-        # Get events that need reminders
-        events_needing_reminders = await event_service.get_events_needing_reminders(REMINDER_WINDOWS)
+        # Reminders are indexed by fire time at sync; build the index here only before the first sync.
+        # Never from placeholders: they would get reminders and become the snapshot the next sync diffs against
+        if reminder_schedule_store.load() is None:
+            upcoming_events = await event_service.get_upcoming_events()
+            if not event_service.fallback_sources():
+                reminder_schedule_store.save(ReminderSchedule(upcoming_events, REMINDER_WINDOWS))
         
-        for event in events_needing_reminders:
-            reminder_key = event["reminder_key"]
-            
-            if not reminder_tracker.is_reminder_sent(reminder_key):
-                result = await sms_client.send_ai_reminder(event, event["reminder_type"])
-                
-                if result["success"]:
-                    reminder_tracker.mark_reminder_sent(reminder_key)
-                    reminders_sent.append({
-                        "event_id": event["id"],
-                        "event_title": event["title"],
-                        "reminder_type": event["reminder_type"],
-                        "message_id": result.get("message_id"),
-                        "ai_generated": result.get("ai_generated", False),
-                        "tokens_used": result.get("tokens_used", 0),
-                        "service": result.get("service", "TextBelt"),
-                        "quota_remaining": result.get("quota_remaining")
-                    })
+        # Everything that fired since the last tick, so a late cron run doesn't skip any.
+        # Generation and sending overlap across reminders, within per-stage limits
+        dispatcher = ReminderDispatcher(sms_client, reminder_tracker, message_store=reminder_message_store)
+        reminders_sent = await send_due_reminders(dispatcher, reminder_schedule_store)
         
         return {
             "status": "success",
             "reminders_sent": len(reminders_sent),
             "details": reminders_sent,
+            "delivery": dispatcher.delivery_stats,
             "timestamp": datetime.utcnow().isoformat()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        await sms_client.close()
 
 @router.post("/updates")
-async def send_live_updates():
+async def send_live_updates(
+    event_service: EventService = Depends(get_event_service),
+    reminder_tracker: ReminderTracker = Depends(get_reminder_tracker),
+    sms_client: TextBeltSMSClient = Depends(get_sms_client)
+):
     """Send live updates about today's events (for 5-minute intervals)"""
     try:
-        event_service = EventService()
-        reminder_tracker = ReminderTracker()
-        sms_client = TextBeltSMSClient(
-            api_key=os.getenv("TEXTBELT_API_KEY"),
-            to_number=os.getenv("SMS_TO_NUMBER", "+12098128451")
-        )
-        
         # Get today's events
         upcoming_events = await event_service.get_upcoming_events()
         now = datetime.utcnow()
@@ -86,7 +69,9 @@ async def send_live_updates():
         # Create update key for this 5-minute interval
         interval_key = f"update_{now.strftime('%Y%m%d_%H%M')}"
         
-        if not reminder_tracker.is_reminder_sent(interval_key) and today_events:
+        # Claim the interval first so an overlapping run can't send the same update
+        claim = reminder_tracker.claim_reminder(interval_key) if today_events else None
+        if claim:
             # Create update message
             if len(today_events) == 1:
                 event = today_events[0]
@@ -109,16 +94,30 @@ async def send_live_updates():
                 if len(today_events) > 3:
                     message += f"...and {len(today_events) - 3} more!"
             
-            result = await sms_client.send_sms(message)
+            # Same fan-out as reminders: every subscriber, tracked per recipient under the interval key
+            message_generator = MessageGenerator(content=message, tokens_used=0, model="template")
+            try:
+                delivery = await FanoutSender(sms_client, reminder_tracker).deliver(
+                    message_generator, subscriber_registry.recipients(), interval_key
+                )
+            except Exception:
+                reminder_tracker.release_reminder(interval_key, claim)
+                raise
             
-            if result["success"]:
-                reminder_tracker.mark_reminder_sent(interval_key)
+            if delivery["failed"] or delivery["deferred"]:
+                reminder_tracker.release_reminder(interval_key, claim)
+            else:
+                reminder_tracker.commit_reminder(interval_key, claim)
+            sent = [result for result in delivery["results"] if result["status"] == "sent"]
+            if sent:
                 return {
                     "status": "success",
                     "update_sent": True,
                     "events_today": len(today_events),
-                    "message_id": result.get("message_id"),
-                    "quota_remaining": result.get("quota_remaining"),
+                    "message_id": sent[0].get("message_id"),
+                    "quota_remaining": delivery["quota_remaining"],
+                    "recipients_sent": delivery["sent"],
+                    "recipients_failed": delivery["failed"],
                     "timestamp": datetime.utcnow().isoformat()
                 }
         
@@ -132,18 +131,14 @@ async def send_live_updates():
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        await sms_client.close()
+
 @router.post("/demo")
-async def send_demo_sms():
+async def send_demo_sms(
+    event_service: EventService = Depends(get_event_service),
+    sms_client: TextBeltSMSClient = Depends(get_sms_client)
+):
     """Demo endpoint: Send SMS with next planned event regardless of timing"""
     try:
-        event_service = EventService()
-        sms_client = TextBeltSMSClient(
-            api_key=os.getenv("TEXTBELT_API_KEY"),
-            to_number=os.getenv("SMS_TO_NUMBER", "+12098128451")
-        )
-        
         # Get all upcoming events
         upcoming_events = await event_service.get_upcoming_events()
         
@@ -180,8 +175,6 @@ async def send_demo_sms():
             }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        await sms_client.close()
 
 @router.get("/test-scraper")
 async def test_scraper():
@@ -189,7 +182,7 @@ async def test_scraper():
     try:
         # Direct test of the scraper
         from calendar_agent.utils.luma_scraper import LumaScraper
-        scraper = LumaScraper("https://lu.ma/usr-vZ7w2FE5gUi7f1Y")
+        scraper = LumaScraper("https://lu.ma/usr-vZ7w2FE5gUi7f1Y", client=get_http_client("luma"))
         events = await scraper.fetch_events()
         return {
             "status": "success",
@@ -201,14 +194,9 @@ async def test_scraper():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/force-demo")
-async def force_demo_sms():
+async def force_demo_sms(sms_client: TextBeltSMSClient = Depends(get_sms_client)):
     """Force demo SMS with guaranteed event data"""
     try:
-        sms_client = TextBeltSMSClient(
-            api_key=os.getenv("TEXTBELT_API_KEY"),
-            to_number=os.getenv("SMS_TO_NUMBER", "+12098128451")
-        )
-        
         # Force a sample event
         event_time = datetime.utcnow() + timedelta(days=2)
         formatted_time = event_time.strftime("%m/%d at %I:%M %p")
@@ -233,5 +221,3 @@ async def force_demo_sms():
             }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        await sms_client.close()
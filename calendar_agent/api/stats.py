@@ -1,19 +1,23 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from datetime import datetime, timedelta
+from calendar_agent.api.dependencies import get_event_service, get_reminder_tracker
 from calendar_agent.utils.event_service import EventService
 from calendar_agent.utils.reminder_tracker import ReminderTracker
 
 router = APIRouter()
 
 @router.get("/stats")
-async def get_stats():
+async def get_stats(
+    event_service: EventService = Depends(get_event_service),
+    reminder_tracker: ReminderTracker = Depends(get_reminder_tracker)
+):
     try:
-        event_service = EventService()
-        reminder_tracker = ReminderTracker()
-        
         stats = await event_service.get_event_stats()
         
         reminders_sent_count = reminder_tracker.get_reminders_sent_count()
+        reminders_sent_24h = reminder_tracker.get_reminders_sent_count(
+            since=datetime.utcnow() - timedelta(hours=24)
+        )
         
         return {
             "status": "success",
@@ -22,6 +26,7 @@ async def get_stats():
                 "upcoming_events": stats["upcoming_events"],
                 "past_events": stats["past_events"],
                 "reminders_sent_total": reminders_sent_count,
+                "reminders_sent_24h": reminders_sent_24h,
                 "data_source": "Luma (live)"
             },
             "next_event": stats["next_event"],
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from pydantic import BaseModel, field_validator
+from calendar_agent.api.dependencies import require_admin_token
+from calendar_agent.utils.subscribers import normalize_phone, subscriber_registry
+
+# Every route here reads or changes who gets texted on our TextBelt quota
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+class Subscriber(BaseModel):
+    phone: str
+    name: str = ""
+
+    @field_validator("phone")
+    @classmethod
+    def _normalize_phone(cls, phone: str) -> str:
+        # Stored in E.164 so "3055550100" and "+13055550100" are one subscriber
+        return normalize_phone(phone)
+
+@router.get("/subscribers")
+async def list_subscribers():
+    subscribers = subscriber_registry.list()
+    return {
+        "status": "success",
+        "count": len(subscribers),
+        "subscribers": subscribers,
+        # Who actually gets messages while nobody has subscribed
+        "recipients": subscriber_registry.recipients(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+@router.post("/subscribers")
+async def add_subscriber(subscriber: Subscriber):
+    if not subscriber_registry.add(subscriber.phone, subscriber.name):
+        raise HTTPException(status_code=500, detail="Could not save subscriber")
+    return {
+        "status": "success",
+        "phone": subscriber.phone,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+@router.delete("/subscribers/{phone}")
+async def remove_subscriber(phone: str):
+    try:
+        phone = normalize_phone(phone)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not subscriber_registry.remove(phone):
+        raise HTTPException(status_code=404, detail="Not subscribed")
+    return {
+        "status": "success",
+        "phone": phone,
+        "timestamp": datetime.utcnow().isoformat()
+    }
@@ -1,22 +1,162 @@
-from fastapi import APIRouter, HTTPException
-from datetime import datetime
 import os
-from calendar_agent.utils.event_service import EventService
+from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Any, Dict, List
+from calendar_agent.api.dependencies import get_ai_summarizer, get_event_service, get_reminder_tracker, get_sms_client
+from calendar_agent.utils.ai_summarizer import AISummarizer
+from calendar_agent.utils.event_diff import diff_events
+from calendar_agent.utils.event_service import REMINDER_WINDOWS, EventService
+from calendar_agent.utils.fanout import FanoutSender
+from calendar_agent.utils.reminder_messages import precompute_reminder_messages, reminder_message_store
+from calendar_agent.utils.reminder_schedule import ReminderSchedule, reminder_schedule_store
+from calendar_agent.utils.reminder_scheduler import notify_schedule_changed
+from calendar_agent.utils.reminder_tracker import ReminderTracker
+from calendar_agent.utils.subscribers import subscriber_registry
+from calendar_agent.utils.textbelt_sms import TextBeltSMSClient
 
 router = APIRouter()
 
 @router.post("/sync")
-async def sync_events():
+async def sync_events(
+    event_service: EventService = Depends(get_event_service),
+    ai_summarizer: AISummarizer = Depends(get_ai_summarizer),
+    sms_client: TextBeltSMSClient = Depends(get_sms_client),
+    reminder_tracker: ReminderTracker = Depends(get_reminder_tracker)
+):
     try:
-        event_service = EventService()
-        events = await event_service.fetch_all_events()
-        
+        return await run_sync(event_service, ai_summarizer, sms_client, reminder_tracker)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def run_sync(
+    event_service: EventService,
+    ai_summarizer: AISummarizer,
+    sms_client: TextBeltSMSClient,
+    reminder_tracker: ReminderTracker
+) -> Dict[str, Any]:
+    """Refresh events and process only what changed since the last sync (also run by the scheduler).
+
+    New events are announced, changed ones get their reminder texts regenerated and
+    re-indexed, and cancelled or finished ones lose their texts and reminders. Texts
+    missing for unchanged events are retried, and so are announcements that were over
+    the per-sync cap or didn't reach every subscriber.
+    """
+    events = await event_service.refresh_events()
+    
+    # The saved reminder schedule doubles as the snapshot of the previous sync
+    previous = reminder_schedule_store.load()
+    
+    # Diffing placeholders (or nothing) against real events would "cancel" every real
+    # event and announce fake ones; keep the previous snapshot until Luma answers again
+    fallback_sources = event_service.fallback_sources()
+    if fallback_sources:
         return {
-            "status": "success",
-            "total_events": len(events),
-            "events_fetched": len(events),
-            "source": "Luma (live)",
+            "status": "skipped",
+            "reason": "No real events fetched from: " + ", ".join(fallback_sources),
+            "sources": event_service.fetch_report,
+            "changes": {},
+            "reminders_scheduled": len(previous or []),
+            "announcements": [],
             "timestamp": datetime.utcnow().isoformat()
         }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+    
+    upcoming_events = await event_service.get_upcoming_events(events)
+    diff = diff_events(previous.events if previous else {}, upcoming_events, datetime.utcnow())
+    
+    if previous is None:
+        # No snapshot to diff against: full rebuild, and nothing counts as newly announced
+        removed = reminder_message_store.delete_events_except([event["id"] for event in upcoming_events])
+    else:
+        removed = reminder_message_store.delete_events(
+            [event["id"] for event in diff["cancelled"] + diff["ended"] + diff["replaced"]]
+        )
+    
+    # Write reminder texts now so /api/remind only has to look them up and send. Every
+    # upcoming event goes in: stored texts are reused, so only new or changed events and
+    # texts an earlier sync couldn't generate (AI down, out of time) cost a request.
+    messages = await precompute_reminder_messages(
+        ai_summarizer,
+        reminder_message_store,
+        upcoming_events,
+        REMINDER_WINDOWS
+    )
+    messages["removed"] = removed
+    
+    # Re-index reminders by fire time only when the event set actually changed
+    event_set_changed = previous is None or diff["added"] or diff["changed"] or diff["cancelled"] or diff["ended"]
+    if event_set_changed:
+        reminder_schedule_store.save(ReminderSchedule(upcoming_events, REMINDER_WINDOWS))
+        # Let an in-process scheduler re-plan once the new texts are in place
+        notify_schedule_changed()
+    
+    announcements = []
+    if previous is not None and announcements_enabled():
+        # New events plus ones still owed an announcement from earlier syncs, while they are upcoming
+        pending = set(reminder_schedule_store.pending_announcements())
+        pending.update(event["id"] for event in diff["added"])
+        to_announce = [event for event in upcoming_events if event["id"] in pending]
+        if to_announce:
+            announcements = await announce_new_events(sms_client, reminder_tracker, to_announce)
+        delivered = {announcement["event_id"] for announcement in announcements if announcement["delivered"]}
+        reminder_schedule_store.set_pending_announcements([
+            event["id"] for event in to_announce
+            if event["id"] not in delivered and not reminder_tracker.is_reminder_sent(announcement_key(event))
+        ])
+    
+    return {
+        "status": "success",
+        "total_events": len(events),
+        "events_fetched": len(events),
+        "source": "Luma (live)",
+        "sources": event_service.fetch_report,
+        "changes": {kind: len(diff[kind]) for kind in diff},
+        "reminder_messages": messages,
+        "reminders_scheduled": len(reminder_schedule_store.load() or []),
+        "announcements": announcements,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+def announcements_enabled() -> bool:
+    return os.getenv("ANNOUNCE_NEW_EVENTS", "true").lower() in ("1", "true", "yes")
+
+def announcement_key(event: Dict[str, Any]) -> str:
+    return f"{event['id']}_announcement"
+
+async def announce_new_events(
+    sms_client: TextBeltSMSClient,
+    reminder_tracker: ReminderTracker,
+    new_events: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Send one AI announcement per new event to every subscriber, at most ANNOUNCE_MAX_PER_SYNC per sync.
+    
+    The rest are left for the caller to carry over to the next sync.
+    """
+    fanout = FanoutSender(sms_client, reminder_tracker)
+    recipients = subscriber_registry.recipients()
+    announcements = []
+    for event in new_events[:int(os.getenv("ANNOUNCE_MAX_PER_SYNC", "3"))]:
+        # Claimed like reminders, so overlapping syncs announce an event once
+        key = announcement_key(event)
+        claim = reminder_tracker.claim_reminder(key)
+        if claim is None:
+            continue
+        try:
+            message_generator = await sms_client.ai_summarizer.generate_new_event_announcement(event)
+            delivery = await fanout.deliver(message_generator, recipients, key)
+        except Exception:
+            reminder_tracker.release_reminder(key, claim)
+            raise
+        delivered = not (delivery["failed"] or delivery["deferred"])
+        if delivered:
+            reminder_tracker.commit_reminder(key, claim)
+        else:
+            reminder_tracker.release_reminder(key, claim)
+        announcements.append({
+            "event_id": event["id"],
+            "event_title": event["title"],
+            "delivered": delivered,
+            "recipients_sent": delivery["sent"],
+            "recipients_failed": delivery["failed"],
+            "tokens_used": message_generator.tokens_used
+        })
+    return announcements
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""Compare event-extraction backends on saved Luma pages.
+
+    python -m calendar_agent.benchmarks.extraction                 # synthetic 10/100/1000-card pages
+    python -m calendar_agent.benchmarks.extraction saved_page.html  # your own saved pages
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from calendar_agent.benchmarks.fixtures import render_luma_page
+from calendar_agent.utils.html_extractor import BACKENDS, available_backends
+from calendar_agent.utils.luma_scraper import LumaScraper
+
+LEGACY_SELECTORS = [
+    'a[href*="/event/"]',
+    'div[data-testid*="event"]',
+    '.event-card',
+    '.content-card',
+    '[data-event-id]',
+    'article',
+    '.card'
+]
+
+def legacy_soup_cascade(html: str) -> List[Dict]:
+    """The pre-engine path: BeautifulSoup tree, selector cascade, per-card lookups"""
+    scraper = LumaScraper("https://lu.ma/benchmark")
+    soup = BeautifulSoup(html, 'html.parser')
+    events = []
+    for selector in LEGACY_SELECTORS:
+        for element in soup.select(selector):
+            event_data = scraper._extract_event_data(element)
+            if event_data:
+                events.append(event_data)
+        if events:
+            break
+    return events
+
+def time_call(func: Callable[[str], List], html: str, repeat: int) -> Tuple[float, int]:
+    best = float("inf")
+    result = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(html)
+        best = min(best, time.perf_counter() - started)
+    return best, len(result)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", help="saved Luma HTML pages (default: synthetic pages)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement; the best is reported")
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = [(Path(page).name, Path(page).read_text(encoding="utf-8")) for page in args.pages]
+    else:
+        pages = [(f"synthetic-{n}", render_luma_page(n)) for n in (10, 100, 1000)]
+
+    candidates = {"bs4 cascade (legacy)": legacy_soup_cascade}
+    for name in available_backends():
+        candidates[f"single-pass {name}"] = BACKENDS[name]
+
+    for page_name, html in pages:
+        print(f"\n{page_name} ({len(html) / 1024:.0f} KiB)")
+        baseline = None
+        for name, func in candidates.items():
+            seconds, found = time_call(func, html, args.repeat)
+            baseline = baseline or seconds
+            print(f"  {name:<24} {seconds * 1000:9.2f} ms  {found:5d} events  {baseline / seconds:6.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+TITLES = [
+    "Community Build Session",
+    "Neural Networks Workshop",
+    "Founders Breakfast",
+    "Design Systems Night",
+    "Open Source Friday",
+    "Pitch Practice Lab",
+    "Web3 Builders Meetup",
+    "Creative Coding Jam"
+]
+
+def render_luma_page(card_count: int, start: datetime = datetime(2025, 1, 6, 23, 0)) -> str:
+    """Render a deterministic Luma-style calendar page with ``card_count`` event cards.
+
+    Each card links to its event twice (cover image and title), like the real page,
+    and sits inside the usual nest of layout divs.
+    """
+    cards = []
+    for i in range(card_count):
+        title = f"{TITLES[i % len(TITLES)]} #{i + 1}"
+        when = start + timedelta(hours=6 * i)
+        slug = f"/event/evt-{i:05d}"
+        cards.append(f"""
+      <div class="timeline-section">
+        <div class="date-title"><div class="date">{when.strftime('%b %d')}</div></div>
+        <div class="content-card event-card" data-event-id="evt-{i:05d}">
+          <a class="cover-link" href="{slug}?tk=abc{i}"><img src="https://images.lu.ma/cover-{i}.png" alt=""></a>
+          <div class="info">
+            <div class="event-time"><time datetime="{when.isoformat()}Z">{when.strftime('%I:%M %p')}</time></div>
+            <a href="{slug}"><h3 class="title">{title}</h3></a>
+            <div class="host-row"><span>By The Lab Miami</span></div>
+            <div class="venue-location"><span>The LAB Miami, 400 NW 26th St</span></div>
+            <p class="event-description">Hands-on session number {i + 1} for builders, designers and founders.</p>
+          </div>
+        </div>
+      </div>""")
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>The Lab Miami - Luma</title>
+  <link rel="stylesheet" href="/styles.css">
+</head>
+<body>
+  <nav class="top-nav"><a href="/discover">Discover</a><a href="/signin">Sign In</a></nav>
+  <header class="profile-header"><h1>The Lab Miami</h1><button>Follow</button></header>
+  <main class="timeline">{''.join(cards)}
+  </main>
+  <footer><a href="/about">About</a><a href="/help">Help</a></footer>
+</body>
+</html>
+"""
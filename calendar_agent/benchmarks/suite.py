@@ -0,0 +1,175 @@
+"""Micro-benchmarks for the scraper, scheduling and SMS paths, checked against a JSON baseline.
+
+    python -m calendar_agent.benchmarks.suite --save     # record a baseline on this machine
+    python -m calendar_agent.benchmarks.suite            # compare against it; exits 1 on a regression
+    python -m calendar_agent.benchmarks.suite --only parse_date --sizes 1000
+
+Every case runs on synthetic Luma pages of 10, 100 and 1000 event cards (fixtures.py).
+A case regresses when its best time is more than --threshold slower than the baseline.
+Baselines are machine-specific: record and compare on the same hardware.
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from calendar_agent.benchmarks.fixtures import render_luma_page
+from calendar_agent.utils.ai_summarizer import AISummarizer
+from calendar_agent.utils.date_parser import _parse_cached
+from calendar_agent.utils.event_service import REMINDER_WINDOWS
+from calendar_agent.utils.luma_scraper import LumaScraper
+from calendar_agent.utils.reminder_schedule import ReminderSchedule
+from calendar_agent.utils.textbelt_sms import TextBeltSMSClient
+
+SIZES = (10, 100, 1000)
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+BENCH_URL = "https://lu.ma/benchmark"
+
+class _NoClient:
+    """Stands in for the HTTP and OpenAI clients; nothing benchmarked here goes over the network"""
+
+    async def aclose(self):
+        pass
+
+# A case builds its input for a page size and returns (function to time, items it handles)
+Case = Callable[[int], Tuple[Callable[[], Any], int]]
+
+def extract_event_data(size: int):
+    scraper = LumaScraper(BENCH_URL, client=_NoClient())
+    cards = BeautifulSoup(render_luma_page(size), 'html.parser').select('[data-event-id]')
+    return lambda: [scraper._extract_event_data(card) for card in cards], len(cards)
+
+def enhanced_fallback_extraction(size: int):
+    scraper = LumaScraper(BENCH_URL, client=_NoClient())
+    soup = BeautifulSoup(render_luma_page(size), 'html.parser')
+    return lambda: scraper._enhanced_fallback_extraction(soup), size
+
+def parse_date(size: int):
+    scraper = LumaScraper(BENCH_URL, client=_NoClient())
+    # The date strings a page really carries: ISO datetimes plus "Jan 06"-style labels and times
+    soup = BeautifulSoup(render_luma_page(size), 'html.parser')
+    texts = [time["datetime"] for time in soup.find_all("time")]
+    texts += [f"{date.get_text()} {time.get_text()}" for date, time in zip(soup.select(".date"), soup.find_all("time"))]
+
+    def run():
+        # Time the parsing itself, not the memo in front of it
+        _parse_cached.cache_clear()
+        return [scraper._parse_date(text) for text in texts]
+    return run, len(texts)
+
+def reminder_schedule(size: int):
+    # Cards start 6 hours apart beginning just under 2 hours from now, so some reminders are due
+    now = datetime.utcnow().replace(second=0, microsecond=0)
+    scraper = LumaScraper(BENCH_URL, client=_NoClient())
+    events = scraper._parse_events(render_luma_page(size, start=now + timedelta(hours=2, minutes=-5)))
+    # What /api/sync builds and one /api/remind tick reads back
+    return lambda: ReminderSchedule(events, REMINDER_WINDOWS).due(now - timedelta(minutes=15), now), len(events)
+
+def optimize_for_sms(size: int):
+    summarizer = AISummarizer(client=_NoClient(), cache=None)
+    sms = TextBeltSMSClient("benchmark", client=_NoClient(), ai_summarizer=summarizer)
+    events = LumaScraper(BENCH_URL, client=_NoClient())._parse_events(render_luma_page(size))
+    # Template reminders of every kind: short ones pass through, announcements get truncated
+    messages = []
+    for event in events:
+        messages.append(summarizer._fallback_message(event, "24_hours").content)
+        messages.append(summarizer._fallback_new_event(event).content)
+    return lambda: [sms._optimize_for_sms(message) for message in messages], len(messages)
+
+CASES: Dict[str, Case] = {
+    "extract_event_data": extract_event_data,
+    "enhanced_fallback_extraction": enhanced_fallback_extraction,
+    "parse_date": parse_date,
+    "reminder_schedule": reminder_schedule,
+    "optimize_for_sms": optimize_for_sms
+}
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Best and median seconds per call, with enough calls per run to outlast timer noise"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    runs = sorted(total / number for total in timer.repeat(repeat=repeat, number=number))
+    return {"best_ms": runs[0] * 1000, "median_ms": runs[len(runs) // 2] * 1000}
+
+def run_suite(names: List[str], sizes: List[int], repeat: int) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for name in names:
+        for size in sizes:
+            func, items = CASES[name](size)
+            timing = measure(func, repeat)
+            results[f"{name}[{size}]"] = {
+                "best_ms": round(timing["best_ms"], 4),
+                "median_ms": round(timing["median_ms"], 4),
+                "items": items
+            }
+    return results
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float) -> List[str]:
+    """Print each case against the baseline; returns the names of the ones that regressed"""
+    regressions = []
+    print(f"{'case':<40}{'best ms':>12}{'baseline':>12}{'change':>10}")
+    for key, result in results.items():
+        before = baseline.get(key)
+        if before is None:
+            print(f"{key:<40}{result['best_ms']:>12.3f}{'-':>12}{'new':>10}")
+            continue
+        change = result["best_ms"] / before["best_ms"] - 1 if before["best_ms"] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{key:<40}{result['best_ms']:>12.3f}{before['best_ms']:>12.3f}{change:>+10.1%}{flag}")
+    return regressions
+
+def machine() -> Dict[str, str]:
+    return {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.machine()}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="write this run's results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown that counts as a regression (0.2 = 20%%)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case; the best is compared")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="event cards per page")
+    parser.add_argument("--only", nargs="+", choices=list(CASES), default=list(CASES), help="cases to run")
+    args = parser.parse_args()
+
+    results = run_suite(args.only, args.sizes, args.repeat)
+
+    if args.save:
+        # Merge, so a partial run (--only/--sizes) refreshes just its own cases
+        stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        stored["machine"] = machine()
+        stored["recorded_at"] = datetime.utcnow().isoformat()
+        stored.setdefault("results", {}).update(results)
+        args.baseline.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+        for key, result in results.items():
+            print(f"{key:<40}{result['best_ms']:>12.3f} ms")
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        for key, result in results.items():
+            print(f"{key:<40}{result['best_ms']:>12.3f} ms")
+        print(f"\nNo baseline at {args.baseline}; record one with --save")
+        return
+
+    stored = json.loads(args.baseline.read_text())
+    if stored.get("machine") != machine():
+        print(f"Note: baseline was recorded on {stored.get('machine')}; timings may not be comparable\n")
+    regressions = compare(results, stored.get("results", {}), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+if __name__ == "__main__":
+    main()
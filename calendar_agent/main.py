@@ -1,11 +1,56 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from calendar_agent.api import sync, remind, stats, digest
+from calendar_agent.api import sync, remind, stats, digest, metrics, subscribers
+from calendar_agent.api.dependencies import get_ai_summarizer, get_event_service, get_reminder_tracker, get_sms_client
+from calendar_agent.utils.circuit_breaker import breaker_states
+from calendar_agent.utils.deadline import DeadlineMiddleware
+from calendar_agent.utils.http_clients import close_clients, open_clients
+from calendar_agent.utils.reminder_dispatch import ReminderDispatcher
+from calendar_agent.utils.reminder_messages import reminder_message_store
+from calendar_agent.utils.reminder_schedule import reminder_schedule_store
+from calendar_agent.utils.reminder_scheduler import ReminderScheduler, scheduler_enabled
 from dotenv import load_dotenv
 
 load_dotenv()
 
-app = FastAPI(title="Calendar Sync & Reminder Agent", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep-alive pools for Luma, TextBelt and OpenAI live as long as the app. Serverless
+    # invocations create them on first use, so cold starts skip importing httpx/openai.
+    
+    # Long-running deployments can send reminders on time from here instead of cron polling
+    scheduler = None
+    if scheduler_enabled():
+        open_clients()
+        scheduler = ReminderScheduler(
+            reminder_schedule_store,
+            make_dispatcher=_make_dispatcher,
+            sync=_run_sync
+        )
+        scheduler.start()
+    
+    yield
+    
+    if scheduler:
+        await scheduler.stop()
+    await close_clients()
+
+async def _run_sync():
+    ai_summarizer = get_ai_summarizer()
+    await sync.run_sync(get_event_service(), ai_summarizer, get_sms_client(ai_summarizer), get_reminder_tracker())
+
+def _make_dispatcher() -> ReminderDispatcher:
+    return ReminderDispatcher(
+        get_sms_client(get_ai_summarizer()),
+        get_reminder_tracker(),
+        message_store=reminder_message_store
+    )
+
+app = FastAPI(title="Calendar Sync & Reminder Agent", version="1.0.0", lifespan=lifespan)
+
+# Every request gets a time budget that scraping, generation and sending all draw from
+app.add_middleware(DeadlineMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,6 +64,8 @@ app.include_router(sync.router, prefix="/api")
 app.include_router(remind.router, prefix="/api")
 app.include_router(stats.router, prefix="/api")
 app.include_router(digest.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
+app.include_router(subscribers.router, prefix="/api")
 
 @app.get("/")
 async def root():
@@ -31,10 +78,12 @@ async def root():
             "/api/remind",
             "/api/updates",
             "/api/digest",
-            "/api/stats"
+            "/api/stats",
+            "/api/metrics",
+            "/api/subscribers"
         ]
     }
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy", "circuits": breaker_states()}
\ No newline at end of file
@@ -0,0 +1,92 @@
+import pytest
+
+from calendar_agent.utils import circuit_breaker as breaker_module
+from calendar_agent.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(breaker_module, "time", clock)
+    return clock
+
+def make_breaker() -> CircuitBreaker:
+    return CircuitBreaker("test", failure_rate=0.5, min_requests=4, window=10, open_seconds=30)
+
+def trip(breaker: CircuitBreaker):
+    for _ in range(breaker.min_requests):
+        assert breaker.allow()
+        breaker.record(False)
+
+def test_stays_closed_below_min_requests_and_failure_rate(clock):
+    breaker = make_breaker()
+
+    for success in (False, True, True, True, False, True):
+        breaker.record(success)
+    # 2 failures in 6, under the 50% failure rate
+    assert breaker.state == CLOSED
+
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record(False)
+    # Every request failed, but fewer than min_requests came in
+    assert breaker.state == CLOSED
+
+    breaker.record(True)
+    assert breaker.state == OPEN
+
+def test_open_refuses_until_open_seconds_pass(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    assert breaker.state == OPEN
+
+    clock.now += 29
+    assert not breaker.allow()
+    assert breaker.snapshot()["retry_in_seconds"] == 1.0
+
+def test_half_open_probe_success_closes(clock):
+    breaker = make_breaker()
+    trip(breaker)
+
+    clock.now += 30
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    # Only one probe at a time
+    assert not breaker.allow()
+
+    breaker.record(True)
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+    assert breaker.snapshot()["recent_requests"] == 0
+
+def test_half_open_probe_failure_reopens(clock):
+    breaker = make_breaker()
+    trip(breaker)
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record(False)
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    clock.now += 30
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+
+def test_lost_probe_stops_blocking_after_open_seconds(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30
+    assert breaker.allow()
+
+    # The probe never records an outcome
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
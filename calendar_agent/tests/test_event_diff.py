@@ -0,0 +1,65 @@
+import json
+from datetime import datetime
+
+from calendar_agent.utils.event_diff import diff_events
+from calendar_agent.utils.luma_scraper import LumaScraper
+
+NOW = datetime(2025, 10, 28, 18, 0)
+
+class _NoClient:
+    async def aclose(self):
+        pass
+
+def luma_page(name: str, url: str = "miami-meetup") -> str:
+    payload = {"props": {"pageProps": {"initialData": {"featured_items": [{"event": {
+        "api_id": "evt-abc123",
+        "name": name,
+        "start_at": "2025-11-01T23:00:00.000Z",
+        "timezone": "America/New_York",
+        "url": url
+    }}]}}}}
+    return f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(payload)}</script>'
+
+def event(event_id: str, title: str, link: str) -> dict:
+    return {"id": event_id, "title": title, "start_time": "2025-11-01T23:00:00", "link": link}
+
+def test_renamed_event_keeps_its_id():
+    scraper = LumaScraper("https://lu.ma/the-lab-miami", client=_NoClient())
+
+    before = scraper._parse_events(luma_page("Miami Meetup"))
+    after = scraper._parse_events(luma_page("Miami Meetup (moved to the rooftop)", url="miami-rooftop"))
+
+    assert before[0]["id"] == after[0]["id"]
+
+def test_dom_card_id_ignores_title_and_tracking_query():
+    scraper = LumaScraper("https://lu.ma/the-lab-miami", client=_NoClient())
+
+    first = scraper._build_event("Miami Meetup", "https://lu.ma/event/evt-abc123?tk=1", "Nov 01")
+    renamed = scraper._build_event("Rooftop Meetup", "https://lu.ma/event/evt-abc123/", "Nov 01")
+
+    assert first["id"] == renamed["id"]
+
+def test_rename_diffs_as_changed():
+    previous = {"a1": event("a1", "Miami Meetup", "https://lu.ma/meetup")}
+
+    diff = diff_events(previous, [event("a1", "Rooftop Meetup", "https://lu.ma/meetup")], NOW)
+
+    assert [e["title"] for e in diff["changed"]] == ["Rooftop Meetup"]
+    assert diff["added"] == [] and diff["cancelled"] == []
+
+def test_same_link_under_a_new_id_is_changed_not_added():
+    previous = {"old": event("old", "Miami Meetup", "https://lu.ma/meetup")}
+
+    diff = diff_events(previous, [event("new", "Miami Meetup", "https://lu.ma/meetup")], NOW)
+
+    assert [e["id"] for e in diff["changed"]] == ["new"]
+    assert [e["id"] for e in diff["replaced"]] == ["old"]
+    assert diff["added"] == [] and diff["cancelled"] == []
+
+def test_added_and_cancelled():
+    previous = {"a1": event("a1", "Miami Meetup", "https://lu.ma/meetup")}
+
+    diff = diff_events(previous, [event("b2", "Founders Breakfast", "https://lu.ma/breakfast")], NOW)
+
+    assert [e["id"] for e in diff["added"]] == ["b2"]
+    assert [e["id"] for e in diff["cancelled"]] == ["a1"]
@@ -0,0 +1,51 @@
+import asyncio
+
+import httpx
+
+from calendar_agent.utils import deadline
+from calendar_agent.utils.circuit_breaker import CircuitBreaker
+from calendar_agent.utils.outbound import OutboundTransport, ProviderPolicy
+
+class Unavailable(httpx.AsyncBaseTransport):
+    """Always 503 with a short Retry-After; records each attempt's timeouts and time left"""
+
+    def __init__(self):
+        self.attempts = []
+
+    async def handle_async_request(self, request):
+        self.attempts.append((deadline.remaining(), dict(request.extensions["timeout"])))
+        return httpx.Response(503, headers={"Retry-After": "0.2"})
+
+def make_client(inner: httpx.AsyncBaseTransport) -> httpx.AsyncClient:
+    transport = OutboundTransport(
+        "test",
+        inner,
+        policy=ProviderPolicy("test", rate_per_second=100, burst=10, max_retries=2),
+        breaker=CircuitBreaker("test", min_requests=100)
+    )
+    return httpx.AsyncClient(transport=transport, timeout=30.0)
+
+def test_every_attempt_is_bounded_by_the_time_left():
+    inner = Unavailable()
+
+    async def run():
+        async with make_client(inner) as client:
+            with deadline.deadline_scope(3.0):
+                return await client.get("https://example.test/")
+
+    assert asyncio.run(run()).status_code == 503
+    assert len(inner.attempts) == 3
+    for left, timeouts in inner.attempts:
+        assert all(timeout <= left + 0.01 for timeout in timeouts.values())
+    # Retries start later, so they get less time than the first attempt
+    assert inner.attempts[-1][1]["read"] < inner.attempts[0][1]["read"] - 0.3
+
+def test_client_timeouts_apply_outside_a_deadline():
+    inner = Unavailable()
+
+    async def run():
+        async with make_client(inner) as client:
+            return await client.get("https://example.test/")
+
+    asyncio.run(run())
+    assert all(timeouts["read"] == 30.0 for _, timeouts in inner.attempts)
@@ -0,0 +1,150 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from calendar_agent.utils.reminder_schedule import ReminderSchedule, ReminderScheduleStore
+from calendar_agent.utils.reminder_scheduler import send_due_reminders
+from calendar_agent.utils.reminder_tracker import ReminderTracker
+
+NOW = datetime(2025, 10, 28, 18, 0)
+WINDOWS = [(timedelta(hours=2), "2_hours")]
+
+def event(event_id: str, fires_at: datetime) -> dict:
+    # Starts two hours after its reminder should fire
+    return {"id": event_id, "title": event_id, "start_time": (fires_at + timedelta(hours=2)).isoformat()}
+
+def make_store(tmp_path) -> ReminderScheduleStore:
+    return ReminderScheduleStore(
+        tmp_path / "schedule.db",
+        retry_grace=timedelta(minutes=15),
+        max_catchup=timedelta(minutes=60)
+    )
+
+def due_ids(schedule: ReminderSchedule, since: datetime, until: datetime) -> list:
+    return [reminder["id"] for reminder in schedule.due(since, until)]
+
+class FlakyDispatcher:
+    """Claims each due reminder and sends it, except keys listed in ``failing`` or ``deferring``"""
+
+    def __init__(self, tracker: ReminderTracker, failing=(), deferring=()):
+        self.tracker = tracker
+        self.failing = set(failing)
+        self.deferring = set(deferring)
+        self.seen = []
+        self.deferred_keys = []
+
+    async def dispatch(self, events):
+        sent = []
+        self.deferred_keys = []
+        for reminder in events:
+            self.seen.append(reminder["reminder_key"])
+            claim = self.tracker.claim_reminder(reminder["reminder_key"])
+            if claim is None:
+                continue
+            if reminder["reminder_key"] in self.failing | self.deferring:
+                self.tracker.release_reminder(reminder["reminder_key"], claim)
+                if reminder["reminder_key"] in self.deferring:
+                    self.deferred_keys.append(reminder["reminder_key"])
+            else:
+                self.tracker.commit_reminder(reminder["reminder_key"], claim)
+                sent.append(reminder["reminder_key"])
+        return sent
+
+def test_due_is_half_open_and_sorted():
+    schedule = ReminderSchedule(
+        [event("at_until", NOW), event("first", NOW - timedelta(minutes=10)), event("second", NOW - timedelta(minutes=5))],
+        WINDOWS
+    )
+
+    assert due_ids(schedule, NOW - timedelta(minutes=10), NOW) == ["first", "second"]
+    reminder = schedule.due(NOW - timedelta(minutes=10), NOW)[0]
+    assert reminder["reminder_key"] == "first_2_hours" and reminder["reminder_type"] == "2_hours"
+
+def test_due_skips_events_that_already_started():
+    started = {"id": "started", "title": "started", "start_time": (NOW - timedelta(minutes=1)).isoformat()}
+    schedule = ReminderSchedule([started], [(timedelta(hours=1), "1_hour")])
+
+    assert due_ids(schedule, NOW - timedelta(hours=2), NOW) == []
+
+def test_first_tick_looks_back_by_the_retry_grace(tmp_path):
+    store = make_store(tmp_path)
+
+    assert store.tick_start(NOW) == NOW - timedelta(minutes=15)
+
+def test_late_tick_catches_up_from_the_last_tick(tmp_path):
+    store = make_store(tmp_path)
+    store.set_last_tick(NOW - timedelta(minutes=40))
+    schedule = ReminderSchedule(
+        [event("missed", NOW - timedelta(minutes=30)), event("already_sent", NOW - timedelta(minutes=58))],
+        WINDOWS
+    )
+
+    start = store.tick_start(NOW)
+
+    # Back to the last tick, then the retry grace before it
+    assert start == NOW - timedelta(minutes=55)
+    assert due_ids(schedule, start, NOW) == ["missed"]
+
+def test_catchup_stops_at_max_catchup(tmp_path):
+    store = make_store(tmp_path)
+    store.set_last_tick(NOW - timedelta(hours=5))
+    schedule = ReminderSchedule(
+        [event("within", NOW - timedelta(minutes=50)), event("too_old", NOW - timedelta(minutes=90))],
+        WINDOWS
+    )
+
+    start = store.tick_start(NOW)
+
+    assert start == NOW - timedelta(minutes=60)
+    assert due_ids(schedule, start, NOW) == ["within"]
+
+def test_saved_schedule_round_trips(tmp_path):
+    schedule = ReminderSchedule([event("evt1", NOW), event("evt2", NOW + timedelta(hours=1))], WINDOWS)
+    make_store(tmp_path).save(schedule)
+
+    loaded = make_store(tmp_path).load()
+
+    assert loaded.entries == schedule.entries
+    assert loaded.next_fire_time(NOW) == NOW + timedelta(hours=1)
+
+def test_reminder_failed_at_one_tick_is_sent_at_the_next(tmp_path):
+    store = make_store(tmp_path)
+    tracker = ReminderTracker(tmp_path / "tracking.db")
+    store.save(ReminderSchedule([event("evt1", NOW - timedelta(minutes=5))], WINDOWS))
+    store.set_last_tick(NOW - timedelta(minutes=15))
+
+    failing = FlakyDispatcher(tracker, failing={"evt1_2_hours"})
+    assert asyncio.run(send_due_reminders(failing, store, now=NOW)) == []
+    assert failing.seen == ["evt1_2_hours"]
+
+    # The next cron tick, one interval later
+    retry = FlakyDispatcher(tracker)
+    assert asyncio.run(send_due_reminders(retry, store, now=NOW + timedelta(minutes=15))) == ["evt1_2_hours"]
+
+    # Sent reminders are claimed, not re-sent, while they are still inside the window
+    again = FlakyDispatcher(tracker)
+    assert asyncio.run(send_due_reminders(again, store, now=NOW + timedelta(minutes=30))) == []
+
+def test_deferred_reminder_is_kept_until_sent(tmp_path):
+    store = make_store(tmp_path)
+    tracker = ReminderTracker(tmp_path / "tracking.db")
+    store.save(ReminderSchedule([event("evt1", NOW - timedelta(minutes=5))], WINDOWS))
+    store.set_last_tick(NOW - timedelta(minutes=15))
+
+    # Deferred on two ticks in a row: by the third it is outside the retry grace
+    for tick in (NOW, NOW + timedelta(minutes=15)):
+        deferring = FlakyDispatcher(tracker, deferring={"evt1_2_hours"})
+        assert asyncio.run(send_due_reminders(deferring, store, now=tick)) == []
+    assert store.deferred_reminders() == ["evt1_2_hours"]
+
+    later = NOW + timedelta(minutes=30)
+    assert store.tick_start(later) > NOW - timedelta(minutes=5)
+    retry = FlakyDispatcher(tracker)
+    assert asyncio.run(send_due_reminders(retry, store, now=later)) == ["evt1_2_hours"]
+    assert store.deferred_reminders() == []
+
+def test_deferred_reminder_is_dropped_once_its_event_starts():
+    schedule = ReminderSchedule([event("evt1", NOW - timedelta(minutes=5))], WINDOWS)
+
+    assert [r["reminder_key"] for r in schedule.reminders(["evt1_2_hours"], NOW)] == ["evt1_2_hours"]
+    # The event starts two hours after the reminder fired
+    assert schedule.reminders(["evt1_2_hours"], NOW + timedelta(hours=2)) == []
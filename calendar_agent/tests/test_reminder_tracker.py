@@ -0,0 +1,73 @@
+import threading
+from datetime import timedelta
+
+from calendar_agent.utils import reminder_tracker as tracker_module
+from calendar_agent.utils.reminder_tracker import ReminderTracker
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+def test_racing_claimers_only_one_wins(tmp_path):
+    path = tmp_path / "tracking.db"
+    # Schema first, then separate trackers on one file, like overlapping invocations
+    ReminderTracker(path)._connect()
+    trackers = [ReminderTracker(path) for _ in range(8)]
+    barrier = threading.Barrier(len(trackers))
+    tokens = []
+
+    def claim(tracker):
+        barrier.wait()
+        tokens.append(tracker.claim_reminder("evt1_24_hours"))
+
+    threads = [threading.Thread(target=claim, args=(tracker,)) for tracker in trackers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len([token for token in tokens if token]) == 1
+
+def test_claim_is_exclusive_until_committed(tmp_path):
+    first, second = ReminderTracker(tmp_path / "tracking.db"), ReminderTracker(tmp_path / "tracking.db")
+
+    token = first.claim_reminder("evt1_24_hours")
+    assert token
+    assert second.claim_reminder("evt1_24_hours") is None
+
+    assert first.commit_reminder("evt1_24_hours", token)
+    assert second.is_reminder_sent("evt1_24_hours")
+    assert second.claim_reminder("evt1_24_hours") is None
+
+def test_released_claim_can_be_retried(tmp_path):
+    tracker = ReminderTracker(tmp_path / "tracking.db")
+
+    token = tracker.claim_reminder("evt1_24_hours")
+    assert tracker.release_reminder("evt1_24_hours", token)
+
+    assert tracker.claim_reminder("evt1_24_hours")
+    assert not tracker.is_reminder_sent("evt1_24_hours")
+
+def test_expired_lease_can_be_claimed_by_another_caller(tmp_path, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(tracker_module, "time", clock)
+    lease = timedelta(minutes=5)
+    crashed = ReminderTracker(tmp_path / "tracking.db", lease=lease)
+    other = ReminderTracker(tmp_path / "tracking.db", lease=lease)
+
+    stale_token = crashed.claim_reminder("evt1_24_hours")
+    assert stale_token
+
+    clock.now += lease.total_seconds() - 1
+    assert other.claim_reminder("evt1_24_hours") is None
+
+    clock.now += 1
+    token = other.claim_reminder("evt1_24_hours")
+    assert token and token != stale_token
+
+    # The crashed caller's late release must not drop the new claim
+    crashed.release_reminder("evt1_24_hours", stale_token)
+    assert crashed.claim_reminder("evt1_24_hours") is None
@@ -1,9 +1,25 @@
+import asyncio
+import json
 import os
-import yaml
-from pathlib import Path
-from typing import Dict, Any, Optional
-from openai import AsyncOpenAI
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 from pydantic import BaseModel
+from calendar_agent.utils import deadline
+from calendar_agent.utils.message_cache import MessageCache, message_cache
+from calendar_agent.utils.metrics import ai_messages, ai_request_seconds, ai_tokens
+from calendar_agent.utils.prompt_registry import PromptRegistry, prompt_registry
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+REMINDER_MAX_TOKENS = 150
+REMINDER_TEMPERATURE = 0.7
+
+BATCH_INSTRUCTIONS = """
+
+You will receive several numbered requests. Answer every one of them independently.
+Respond only with a JSON object of the form
+{"messages": [{"id": <request number>, "message": "<reminder text>"}]}
+with one entry per request."""
 
 class MessageGenerator(BaseModel):
     content: str
@@ -11,19 +27,22 @@ class MessageGenerator(BaseModel):
     model: str
 
 class AISummarizer:
-    def __init__(self, api_key: Optional[str] = None):
-        self.client = AsyncOpenAI(
-            api_key=api_key or os.getenv("OPENAI_API_KEY")
-        )
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        client: Optional["AsyncOpenAI"] = None,
+        cache: Optional[MessageCache] = message_cache,
+        prompts: PromptRegistry = prompt_registry
+    ):
+        if client is None:
+            # openai is the heaviest import in the app; only pay for it once a summarizer is built
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+        self.client = client
         self.model = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
-        self.prompts = self._load_prompts()
-    
-    def _load_prompts(self) -> Dict[str, Any]:
-        prompts_file = Path(__file__).parent.parent / "prompts.yaml"
-        if prompts_file.exists():
-            with open(prompts_file, 'r') as f:
-                return yaml.safe_load(f)
-        return {}
+        self.cache = cache
+        # Shared and already compiled; nothing is parsed per summarizer or per message
+        self.prompts = prompts
     
     async def generate_reminder_message(
         self,
@@ -31,69 +50,157 @@ class AISummarizer:
         reminder_type: str = "24_hours"
     ) -> MessageGenerator:
         try:
-            prompt_config = self.prompts.get("event_reminder", {})
-            system_prompt = prompt_config.get("system", "")
-            
-            template = prompt_config.get("templates", {}).get(reminder_type, {})
-            user_prompt = template.get("user", "").format(
-                title=event.get("title", ""),
-                date=event.get("formatted_date", ""),
-                description=event.get("description", "")[:200],
-                location=event.get("location", "The Lab Miami"),
-                link=event.get("link", "")
-            )
+            system_prompt, user_prompt = self._reminder_prompts(event, reminder_type)
             
             if not user_prompt:
                 return self._fallback_message(event, reminder_type)
             
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=150,
-                temperature=0.7
-            )
-            
-            return MessageGenerator(
-                content=response.choices[0].message.content,
-                tokens_used=response.usage.total_tokens,
-                model=response.model
+            return await self._complete(
+                system_prompt,
+                user_prompt,
+                max_tokens=REMINDER_MAX_TOKENS,
+                temperature=REMINDER_TEMPERATURE,
+                kind="reminder"
             )
         except Exception as e:
             print(f"OpenAI error: {e}")
             return self._fallback_message(event, reminder_type)
     
+    async def generate_reminder_messages_batch(
+        self,
+        items: List[Tuple[Dict[str, Any], str]]
+    ) -> List[MessageGenerator]:
+        """Generate reminders for many (event, reminder_type) pairs in as few requests as possible.
+        
+        Items are sent AI_BATCH_SIZE at a time in one chat completion that shares the
+        system prompt and answers in JSON. Results come back in input order; any item
+        missing from (or unparseable in) a batch response is generated on its own.
+        """
+        results: List[Optional[MessageGenerator]] = [None] * len(items)
+        pending = []
+        for index, (event, reminder_type) in enumerate(items):
+            try:
+                system_prompt, user_prompt = self._reminder_prompts(event, reminder_type)
+            except Exception as e:
+                print(f"Prompt error: {e}")
+                user_prompt = ""
+            if not user_prompt:
+                results[index] = self._fallback_message(event, reminder_type)
+                continue
+            cache_key = self._cache_key(system_prompt, user_prompt, REMINDER_MAX_TOKENS, REMINDER_TEMPERATURE)
+            cached = self.cache.get(cache_key) if self.cache else None
+            if cached:
+                ai_messages.inc(kind="reminder", source="cache")
+                results[index] = MessageGenerator(content=cached["content"], tokens_used=0, model=cached["model"])
+            else:
+                pending.append((index, system_prompt, user_prompt, cache_key))
+        
+        batch_size = int(os.getenv("AI_BATCH_SIZE", "10"))
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        for batch_results in await asyncio.gather(*(self._complete_batch(batch) for batch in batches)):
+            for index, message in batch_results.items():
+                results[index] = message
+        
+        # Per-item fallback for whatever the batches didn't answer
+        missing = [index for index, message in enumerate(results) if message is None]
+        generated = await asyncio.gather(*(self.generate_reminder_message(*items[index]) for index in missing))
+        for index, message in zip(missing, generated):
+            results[index] = message
+        
+        return results
+    
+    async def _complete_batch(self, batch: List[Tuple[int, str, str, str]]) -> Dict[int, MessageGenerator]:
+        """One request for a batch of reminder prompts; returns the items it could parse"""
+        if not batch:
+            return {}
+        system_prompt = batch[0][1] + BATCH_INSTRUCTIONS
+        user_prompt = "\n\n".join(
+            f"### Request {request_id}\n{user_prompt}"
+            for request_id, (_, _, user_prompt, _) in enumerate(batch)
+        )
+        
+        try:
+            timeout = deadline.timeout_for(30.0, deadline.GENERATE_RESERVE)
+            if timeout is not None and timeout < 1.0:
+                raise deadline.DeadlineExceeded("no time left for an AI call")
+            with ai_request_seconds.time(model=self.model, kind="reminder_batch"):
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    max_tokens=REMINDER_MAX_TOKENS * len(batch) + 50,
+                    temperature=REMINDER_TEMPERATURE,
+                    response_format={"type": "json_object"},
+                    timeout=timeout
+                )
+            ai_tokens.inc(response.usage.total_tokens, model=response.model)
+            answers = json.loads(response.choices[0].message.content).get("messages", [])
+        except Exception as e:
+            print(f"OpenAI batch error: {e}")
+            return {}
+        
+        contents = {}
+        for answer in answers if isinstance(answers, list) else []:
+            try:
+                request_id = int(answer["id"])
+                content = answer["message"].strip()
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+            if 0 <= request_id < len(batch) and content:
+                contents[request_id] = content
+        
+        # Attribute the request's tokens evenly across the messages it produced
+        share = response.usage.total_tokens // max(len(contents), 1)
+        parsed = {}
+        for request_id, content in contents.items():
+            index, _, _, cache_key = batch[request_id]
+            if self.cache:
+                self.cache.put(cache_key, content, response.model)
+            ai_messages.inc(kind="reminder", source="ai")
+            parsed[index] = MessageGenerator(content=content, tokens_used=share, model=response.model)
+        return parsed
+    
+    def _render(self, name: str, **values: Any) -> Tuple[str, str]:
+        """System and user prompt for a template; empty strings when there is no such template"""
+        template = self.prompts.get(name)
+        if template is None:
+            return "", ""
+        return template.system, template.render(**values)
+    
+    def _reminder_prompts(self, event: Dict[str, Any], reminder_type: str) -> Tuple[str, str]:
+        return self._render(
+            f"event_reminder.{reminder_type}",
+            title=event.get("title", ""),
+            date=event.get("formatted_date", ""),
+            description=event.get("description", "")[:200],
+            location=event.get("location", "The Lab Miami"),
+            link=event.get("link", "")
+        )
+    
     async def generate_new_event_announcement(
         self,
         event: Dict[str, Any]
     ) -> MessageGenerator:
         try:
-            prompt_config = self.prompts.get("new_event", {})
-            system_prompt = prompt_config.get("system", "")
-            user_prompt = prompt_config.get("user", "").format(
+            system_prompt, user_prompt = self._render(
+                "new_event",
                 title=event.get("title", ""),
                 date=event.get("formatted_date", ""),
                 description=event.get("description", "")[:300],
                 location=event.get("location", "The Lab Miami"),
                 link=event.get("link", "")
             )
+            if not user_prompt:
+                return self._fallback_new_event(event)
             
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
+            return await self._complete(
+                system_prompt,
+                user_prompt,
                 max_tokens=200,
-                temperature=0.8
-            )
-            
-            return MessageGenerator(
-                content=response.choices[0].message.content,
-                tokens_used=response.usage.total_tokens,
-                model=response.model
+                temperature=0.8,
+                kind="announcement"
             )
         except Exception as e:
             print(f"OpenAI error: {e}")
@@ -104,34 +211,26 @@ class AISummarizer:
         events: list[Dict[str, Any]]
     ) -> MessageGenerator:
         try:
-            prompt_config = self.prompts.get("weekly_digest", {})
-            system_prompt = prompt_config.get("system", "")
-            
             events_list = "\n".join([
                 f"- {e['title']} ({e['formatted_date']})"
                 for e in events[:5]
             ])
             
-            user_prompt = prompt_config.get("user", "").format(
+            system_prompt, user_prompt = self._render(
+                "weekly_digest",
                 events_list=events_list,
                 event_count=len(events),
                 week_date="this week"
             )
+            if not user_prompt:
+                return self._fallback_digest(events)
             
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
+            return await self._complete(
+                system_prompt,
+                user_prompt,
                 max_tokens=300,
-                temperature=0.7
-            )
-            
-            return MessageGenerator(
-                content=response.choices[0].message.content,
-                tokens_used=response.usage.total_tokens,
-                model=response.model
+                temperature=0.7,
+                kind="digest"
             )
         except Exception as e:
             print(f"OpenAI error: {e}")
@@ -145,25 +244,77 @@ class AISummarizer:
             if len(description) < 150:
                 return description
             
-            prompt_config = self.prompts.get("event_summary", {})
-            system_prompt = prompt_config.get("system", "")
-            user_prompt = prompt_config.get("user", "").format(
-                description=description[:500]
-            )
+            system_prompt, user_prompt = self._render("event_summary", description=description[:500])
+            if not user_prompt:
+                return description[:150] + "..."
             
+            message = await self._complete(
+                system_prompt,
+                user_prompt,
+                max_tokens=50,
+                temperature=0.6,
+                kind="summary"
+            )
+            return message.content
+        except Exception:
+            ai_messages.inc(kind="summary", source="fallback")
+            return description[:150] + "..."
+    
+    async def _complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        temperature: float,
+        kind: str
+    ) -> MessageGenerator:
+        """Chat completion through the message cache; a hit costs no API call and no tokens"""
+        cache_key = self._cache_key(system_prompt, user_prompt, max_tokens, temperature)
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached:
+            ai_messages.inc(kind=kind, source="cache")
+            return MessageGenerator(content=cached["content"], tokens_used=0, model=cached["model"])
+        
+        # Short on time: let the caller fall back to its template instead of racing the deadline
+        timeout = deadline.timeout_for(30.0, deadline.GENERATE_RESERVE)
+        if timeout is not None and timeout < 1.0:
+            raise deadline.DeadlineExceeded("no time left for an AI call")
+        
+        with ai_request_seconds.time(model=self.model, kind=kind):
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
-                max_tokens=50,
-                temperature=0.6
+                max_tokens=max_tokens,
+                temperature=temperature,
+                timeout=timeout
             )
-            
-            return response.choices[0].message.content
-        except Exception:
-            return description[:150] + "..."
+        ai_tokens.inc(response.usage.total_tokens, model=response.model)
+        ai_messages.inc(kind=kind, source="ai")
+        
+        content = response.choices[0].message.content
+        if self.cache and content:
+            self.cache.put(cache_key, content, response.model)
+        
+        return MessageGenerator(
+            content=content,
+            tokens_used=response.usage.total_tokens,
+            model=response.model
+        )
+    
+    def _cache_key(self, system_prompt: str, user_prompt: str, max_tokens: int, temperature: float) -> str:
+        # Batched answers are stored under the key of the equivalent single request
+        return MessageCache.make_key(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
     
     def _fallback_message(self, event: Dict[str, Any], reminder_type: str) -> MessageGenerator:
         reminder_texts = {
@@ -171,6 +322,7 @@ class AISummarizer:
             "2_hours": f"⏰ Starting soon! {event['title']}\n🕒 In 2 hours\n📍 {event.get('location', 'The Lab')}\n🔗 {event['link']}",
             "30_minutes": f"🚨 NOW! {event['title']} starts in 30 min!\n🔗 {event['link']}"
         }
+        ai_messages.inc(kind="reminder", source="fallback")
         
         return MessageGenerator(
             content=reminder_texts.get(reminder_type, reminder_texts["24_hours"]),
@@ -179,6 +331,7 @@ class AISummarizer:
         )
     
     def _fallback_new_event(self, event: Dict[str, Any]) -> MessageGenerator:
+        ai_messages.inc(kind="announcement", source="fallback")
         return MessageGenerator(
             content=f"🎉 New Event!\n\n📅 {event['title']}\n🕒 {event['formatted_date']}\n🔗 RSVP: {event['link']}\n\n{event.get('description', '')[:100]}",
             tokens_used=0,
@@ -190,6 +343,7 @@ class AISummarizer:
         for event in events[:5]:
             digest += f"• {event['title']} - {event['formatted_date']}\n"
         digest += f"\n{len(events)} total events this week!"
+        ai_messages.inc(kind="digest", source="fallback")
         
         return MessageGenerator(
             content=digest,
@@ -0,0 +1,101 @@
+import os
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+from calendar_agent.utils.metrics import circuit_rejections, circuit_state
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker for one outbound provider.
+
+    Closed: requests flow and outcomes are kept for the last ``window`` requests; once
+    at least ``min_requests`` are in and ``failure_rate`` of them failed, it opens.
+    Open: requests are refused immediately, so callers drop to their fallbacks in
+    microseconds, for ``open_seconds``. Half-open: one probe request is let through;
+    success closes the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: Optional[float] = None,
+        min_requests: Optional[int] = None,
+        window: Optional[int] = None,
+        open_seconds: Optional[float] = None
+    ):
+        self.name = name
+        self.failure_rate = failure_rate or float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+        self.min_requests = min_requests or int(os.getenv("CIRCUIT_MIN_REQUESTS", "5"))
+        self.open_seconds = open_seconds or float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+        self._outcomes = deque(maxlen=window or int(os.getenv("CIRCUIT_WINDOW", "20")))
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        circuit_state.set(_STATE_VALUES[CLOSED], provider=name)
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        if self.state == OPEN:
+            if now - self._opened_at < self.open_seconds:
+                circuit_rejections.inc(provider=self.name)
+                return False
+            self._set_state(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            # One probe at a time; a probe that never reported back stops blocking after open_seconds
+            if self._probe_started is not None and now - self._probe_started < self.open_seconds:
+                circuit_rejections.inc(provider=self.name)
+                return False
+            self._probe_started = now
+        return True
+
+    def record(self, success: bool):
+        if self.state == HALF_OPEN:
+            if success:
+                self._outcomes.clear()
+                self._set_state(CLOSED)
+            else:
+                self._open()
+            return
+        self._outcomes.append(success)
+        if len(self._outcomes) >= self.min_requests:
+            failures = self._outcomes.count(False)
+            if failures / len(self._outcomes) >= self.failure_rate:
+                self._open()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "recent_requests": len(self._outcomes),
+            "recent_failures": self._outcomes.count(False),
+            "retry_in_seconds": (
+                round(max(self.open_seconds - (time.monotonic() - self._opened_at), 0.0), 1)
+                if self.state == OPEN else None
+            )
+        }
+
+    def _open(self):
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._set_state(OPEN)
+
+    def _set_state(self, state: str):
+        self.state = state
+        self._probe_started = None
+        circuit_state.set(_STATE_VALUES[state], provider=self.name)
+
+# Module-level so breaker state outlives any one client and carries across warm invocations
+_breakers: Dict[str, CircuitBreaker] = {}
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        breaker = _breakers[provider] = CircuitBreaker(provider)
+    return breaker
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    return {provider: breaker.snapshot() for provider, breaker in _breakers.items()}
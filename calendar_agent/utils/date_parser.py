@@ -0,0 +1,133 @@
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+MIAMI_TIMEZONE = "America/New_York"
+MIAMI_TZ = ZoneInfo(MIAMI_TIMEZONE)
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+
+ISO_DATETIME = re.compile(
+    r'^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?(?:Z|[+-]\d{2}:?\d{2})?$'
+)
+MONTH_DAY = re.compile(
+    r'\b(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?'
+    r'|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?\s+(\d{1,2})(?:st|nd|rd|th)?\b(?:,?\s+(\d{4}))?',
+    re.IGNORECASE
+)
+NUMERIC_DATE = re.compile(r'\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b')
+TWELVE_HOUR_TIME = re.compile(r'\b(\d{1,2})(?::(\d{2}))?\s*([ap])\.?m\.?(?![a-z])', re.IGNORECASE)
+TWENTY_FOUR_HOUR_TIME = re.compile(r'\b([01]?\d|2[0-3]):([0-5]\d)\b')
+RELATIVE_DAY = re.compile(r'\b(today|tonight|tomorrow)\b', re.IGNORECASE)
+WEEKDAY = re.compile(
+    r'\b(mon(?:day)?|tue(?:s(?:day)?)?|wed(?:nesday)?|thu(?:r(?:s(?:day)?)?)?|fri(?:day)?|sat(?:urday)?|sun(?:day)?)\b',
+    re.IGNORECASE
+)
+
+# A month/day without a year is assumed to be upcoming unless it is at most this far back
+MAX_DAYS_IN_PAST = 182
+
+def parse_event_datetime(text: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Parse a Luma date string into a naive UTC datetime, or None if nothing matched.
+
+    Understands ISO timestamps ("2025-10-28T23:00:00.000Z"), "Oct 28", "Oct 28, 2025",
+    "10/28/2025", "7:00 PM", "19:00", "Today"/"Tonight"/"Tomorrow" and weekday names,
+    in any combination. Text without an offset is read as Miami local time; a date
+    without a time means the start of that day, a time without a date means today.
+    """
+    if not text:
+        return None
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    today = now.astimezone(MIAMI_TZ).date()
+    # Relative words and year inference depend on the day, so it is part of the cache key
+    return _parse_cached(" ".join(text.split()), today)
+
+def format_event_time(start_at: datetime, tz_name: Optional[str] = None) -> str:
+    """Human date in the event's local time, e.g. "Oct 28 at 7:00 PM" """
+    try:
+        local = start_at.astimezone(ZoneInfo(tz_name or MIAMI_TIMEZONE))
+    except (KeyError, ValueError):
+        local = start_at.astimezone(MIAMI_TZ)
+    return f"{local:%b} {local.day} at {local.strftime('%I:%M %p').lstrip('0')}"
+
+@lru_cache(maxsize=4096)
+def _parse_cached(text: str, today: date) -> Optional[datetime]:
+    if ISO_DATETIME.match(text):
+        return _parse_iso(text)
+
+    day = _match_date(text, today)
+    clock = _match_time(text)
+    if day is None and clock is None:
+        return None
+
+    local = datetime.combine(day or today, clock or time(0, 0), tzinfo=MIAMI_TZ)
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+def _parse_iso(text: str) -> Optional[datetime]:
+    try:
+        parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=MIAMI_TZ)
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+def _match_date(text: str, today: date) -> Optional[date]:
+    match = MONTH_DAY.search(text)
+    if match:
+        month = MONTHS[match.group(1)[:3].lower()]
+        day = int(match.group(2))
+        if match.group(3):
+            return _safe_date(int(match.group(3)), month, day)
+        candidate = _safe_date(today.year, month, day)
+        if candidate and (today - candidate).days > MAX_DAYS_IN_PAST:
+            candidate = _safe_date(today.year + 1, month, day)
+        return candidate
+
+    match = NUMERIC_DATE.search(text)
+    if match:
+        return _safe_date(int(match.group(3)), int(match.group(1)), int(match.group(2)))
+
+    match = RELATIVE_DAY.search(text)
+    if match:
+        return today + timedelta(days=1 if match.group(1).lower() == "tomorrow" else 0)
+
+    match = WEEKDAY.search(text)
+    if match:
+        ahead = (WEEKDAYS[match.group(1)[:3].lower()] - today.weekday()) % 7
+        return today + timedelta(days=ahead)
+
+    return None
+
+def _match_time(text: str) -> Optional[time]:
+    match = TWELVE_HOUR_TIME.search(text)
+    if match:
+        hour = int(match.group(1))
+        minute = int(match.group(2) or 0)
+        if not 1 <= hour <= 12 or minute > 59:
+            return None
+        hour = hour % 12 + (12 if match.group(3).lower() == "p" else 0)
+        return time(hour, minute)
+
+    match = TWENTY_FOUR_HOUR_TIME.search(text)
+    if match:
+        return time(int(match.group(1)), int(match.group(2)))
+
+    if "tonight" in text.lower():
+        return time(19, 0)
+
+    return None
+
+def _safe_date(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
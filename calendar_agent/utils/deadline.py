@@ -0,0 +1,81 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Seconds a stage leaves for the stages after it
+FETCH_RESERVE = 8.0    # scraping keeps this much for generating and sending
+GENERATE_RESERVE = 4.0  # an AI call keeps this much for sending
+SEND_MINIMUM = 2.0     # an SMS isn't started with less than this left
+
+# Monotonic time by which the current request must be done; None when unbounded
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+class DeadlineExceeded(Exception):
+    """Not enough of the request's time budget is left to start (or finish) a stage"""
+
+def request_budget() -> float:
+    # Below Vercel's 30 s maxDuration, so an invocation winds down instead of being killed
+    return float(os.getenv("REQUEST_BUDGET_SECONDS", "25"))
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[None]:
+    """Bound everything run inside (including tasks it spawns) to ``seconds`` from now.
+
+    Nested scopes can only shorten the deadline, never extend it.
+    """
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current budget, or None outside any deadline scope"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def has_time(seconds: float) -> bool:
+    left = remaining()
+    return left is None or left >= seconds
+
+def timeout_for(default: Optional[float], reserve: float = 0.0) -> Optional[float]:
+    """A stage's timeout: its usual ``default`` (None: none), cut to what the budget allows after ``reserve``"""
+    left = remaining()
+    if left is None:
+        return default
+    budget = max(left - reserve, 0.0)
+    return budget if default is None else min(default, budget)
+
+async def bounded(awaitable: Awaitable[T], default: Optional[float] = None, reserve: float = 0.0) -> T:
+    """Await within timeout_for(default, reserve); raises DeadlineExceeded when it runs out"""
+    timeout = timeout_for(default, reserve)
+    if timeout is None:
+        return await awaitable
+    if timeout <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded(f"no time left (reserving {reserve}s)")
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(f"stage exceeded its {timeout:.1f}s budget")
+
+class DeadlineMiddleware:
+    """ASGI middleware giving every HTTP request its own deadline_scope(request_budget())"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with deadline_scope(request_budget()):
+            await self.app(scope, receive, send)
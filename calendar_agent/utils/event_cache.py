@@ -0,0 +1,70 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+class EventCache:
+    """Process-wide TTL cache for scraped events with single-flight refreshes"""
+
+    def __init__(self, ttl_seconds: float = 300.0):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached events for key if they are still fresh"""
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[0] < self.ttl_seconds:
+            return list(entry[1])
+        return None
+
+    def get_stale(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached events for key however old they are (for when a fresh fetch can't wait)"""
+        entry = self._entries.get(key)
+        return list(entry[1]) if entry else None
+
+    def set(self, key: str, events: List[Dict[str, Any]]):
+        self._entries[key] = (time.monotonic(), list(events))
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one cached entry, or everything when no key is given"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """Return fresh cached events, or join/start the single in-flight fetch"""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(key)
+        # Tasks are bound to the loop that created them; never await a foreign one
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._refresh(key, fetch))
+            self._inflight[key] = task
+
+        # Shield so one cancelled caller doesn't cancel the fetch for everyone else
+        events = await asyncio.shield(task)
+        return list(events)
+
+    async def _refresh(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        try:
+            events = await fetch()
+            self.set(key, events)
+            return events
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+# Shared by every EventService in the process so all endpoints hit one cache
+event_cache = EventCache(ttl_seconds=float(os.getenv("EVENT_CACHE_TTL", "300")))
@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Any, Dict, List
+from calendar_agent.utils.reminder_messages import event_fingerprint
+
+def diff_events(
+    previous: Dict[str, Dict[str, Any]],
+    current: List[Dict[str, Any]],
+    now: datetime
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Keyed diff of two upcoming-event snapshots by event id and content fingerprint.
+
+    Returns lists of events under "added", "changed" (current version), "unchanged",
+    "cancelled" (previous version; gone while still in the future), "ended"
+    (previous version; dropped out of the upcoming list because it has started) and
+    "replaced" (previous version of a changed event that now has another id).
+
+    An event whose id is new but whose link was in the previous snapshot is the same
+    event under another id (older snapshots, or a page read through the DOM instead
+    of the embedded JSON): it is "changed", not cancelled plus added.
+    """
+    diff = {"added": [], "changed": [], "unchanged": [], "cancelled": [], "ended": [], "replaced": []}
+    current_ids = {event["id"] for event in current}
+    previous_by_link = {
+        before["link"]: event_id
+        for event_id, before in previous.items()
+        if before.get("link") and event_id not in current_ids
+    }
+    matched_ids = set()
+    for event in current:
+        previous_id = event["id"] if event["id"] in previous else previous_by_link.pop(event.get("link"), None)
+        if previous_id is None:
+            diff["added"].append(event)
+            continue
+        matched_ids.add(previous_id)
+        before = previous[previous_id]
+        if previous_id != event["id"]:
+            diff["replaced"].append(before)
+            diff["changed"].append(event)
+        elif event_fingerprint(before) != event_fingerprint(event):
+            diff["changed"].append(event)
+        else:
+            diff["unchanged"].append(event)
+
+    for event_id, before in previous.items():
+        if event_id in matched_ids:
+            continue
+        try:
+            started = datetime.fromisoformat(before["start_time"]) <= now
+        except (ValueError, KeyError):
+            started = False
+        diff["ended" if started else "cancelled"].append(before)
+    return diff
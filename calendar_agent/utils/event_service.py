@@ -1,22 +1,125 @@
+import asyncio
 import os
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 from calendar_agent.utils.luma_scraper import LumaScraper
+from calendar_agent.utils import deadline
+from calendar_agent.utils.event_cache import EventCache, event_cache
+
+if TYPE_CHECKING:
+    import httpx
+
+DEFAULT_LUMA_URL = "https://lu.ma/usr-vZ7w2FE5gUi7f1Y"
+
+REMINDER_WINDOWS = [
+    (timedelta(hours=24), "24_hours"),
+    (timedelta(hours=2), "2_hours"),
+    (timedelta(minutes=30), "30_minutes")
+]
+
+def configured_luma_urls() -> List[str]:
+    """Calendars to follow: comma-separated LUMA_URLS, else the single LUMA_URL"""
+    urls = [url.strip() for url in os.getenv("LUMA_URLS", "").split(",") if url.strip()]
+    return urls or [os.getenv("LUMA_URL", DEFAULT_LUMA_URL)]
 
 class EventService:
     """Service for fetching and filtering events directly from Luma"""
     
-    def __init__(self):
-        self.luma_url = os.getenv("LUMA_URL", "https://lu.ma/usr-vZ7w2FE5gUi7f1Y")
-        self.scraper = LumaScraper(self.luma_url)
+    def __init__(
+        self,
+        luma_urls: Optional[List[str]] = None,
+        cache: EventCache = event_cache,
+        client: Optional["httpx.AsyncClient"] = None
+    ):
+        self.luma_urls = luma_urls or configured_luma_urls()
+        self.luma_url = self.luma_urls[0]
+        self.cache = cache
+        
+        max_concurrency = int(os.getenv("LUMA_MAX_CONCURRENCY", "4"))
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # One pooled client shared by every calendar's scraper (the app-wide one when injected)
+        self._owns_client = client is None
+        if client is None:
+            import httpx
+            client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+            )
+        self.client = client
+        self.scrapers = [LumaScraper(url, client=self.client) for url in self.luma_urls]
+        self.scraper = self.scrapers[0]
+        
+        # Per-calendar results of the last fetch: latency, event count, cache hit
+        self.fetch_report: Dict[str, Dict[str, Any]] = {}
     
     async def fetch_all_events(self) -> List[Dict[str, Any]]:
-        """Fetch all events from Luma"""
-        return await self.scraper.fetch_events()
+        """Fetch all events from every calendar concurrently (served from the shared cache within its TTL)"""
+        results = await asyncio.gather(*(self._fetch_source(scraper) for scraper in self.scrapers))
+        return self._merge_events(results)
+    
+    async def refresh_events(self) -> List[Dict[str, Any]]:
+        """Drop the cached events and fetch a fresh copy from Luma"""
+        for url in self.luma_urls:
+            self.cache.invalidate(url)
+        return await self.fetch_all_events()
     
-    async def get_upcoming_events(self) -> List[Dict[str, Any]]:
+    async def _fetch_source(self, scraper: LumaScraper) -> List[Dict[str, Any]]:
+        started = time.perf_counter()
+        scraped = False
+        
+        async def fetch() -> List[Dict[str, Any]]:
+            nonlocal scraped
+            scraped = True
+            # Bound how many calendars hit the network at once
+            async with self._semaphore:
+                return await scraper.fetch_events()
+        
+        degraded = False
+        try:
+            # Leave enough of the request's budget for generating and sending afterwards
+            events = await deadline.bounded(
+                self.cache.get_or_fetch(scraper.luma_url, fetch), reserve=deadline.FETCH_RESERVE
+            )
+        except deadline.DeadlineExceeded as e:
+            # The shielded fetch keeps going for later callers; this one makes do with the last result
+            print(f"Using stale events for {scraper.luma_url}: {e}")
+            events = self.cache.get_stale(scraper.luma_url) or []
+            degraded = True
+        self.fetch_report[scraper.luma_url] = {
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "events": len(events),
+            "cached": not scraped,
+            "degraded": degraded,
+            # No real events from this calendar: placeholders, or nothing at all
+            "fallback": (degraded and not events) or any(event.get("placeholder") for event in events)
+        }
+        return events
+    
+    def fallback_sources(self) -> List[str]:
+        """Calendars whose last fetch produced no real events (see fetch_report)"""
+        return [url for url, report in self.fetch_report.items() if report["fallback"]]
+    
+    def _merge_events(self, results: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Merge per-calendar results, dropping events already seen by id or URL"""
+        merged = []
+        seen_ids = set()
+        seen_links = set()
+        for events in results:
+            for event in events:
+                link = event.get("link")
+                if event["id"] in seen_ids or (link and link in seen_links):
+                    continue
+                seen_ids.add(event["id"])
+                if link:
+                    seen_links.add(link)
+                merged.append(event)
+        return merged
+    
+    async def get_upcoming_events(self, events: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Get events that are in the future"""
-        events = await self.fetch_all_events()
+        if events is None:
+            events = await self.fetch_all_events()
         now = datetime.utcnow()
         
         upcoming = []
@@ -32,9 +135,10 @@ class EventService:
         # Sort by start time
         return sorted(upcoming, key=lambda x: x['start_time'])
     
-    async def get_past_events(self) -> List[Dict[str, Any]]:
+    async def get_past_events(self, events: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Get events that have already happened"""
-        events = await self.fetch_all_events()
+        if events is None:
+            events = await self.fetch_all_events()
         now = datetime.utcnow()
         
         past = []
@@ -50,33 +154,6 @@ class EventService:
         # Sort by start time (most recent first)
         return sorted(past, key=lambda x: x['start_time'], reverse=True)
     
-    async def get_events_needing_reminders(self, reminder_windows: List[tuple]) -> List[Dict[str, Any]]:
-        """Get events that need reminders based on the reminder windows"""
-        upcoming_events = await self.get_upcoming_events()
-        now = datetime.utcnow()
-        
-        events_needing_reminders = []
-        
-        for event in upcoming_events:
-            try:
-                event_time = datetime.fromisoformat(event['start_time'])
-                
-                for window, window_name in reminder_windows:
-                    reminder_time = event_time - window
-                    
-                    # Check if we're in the reminder window (15-minute window)
-                    if now >= reminder_time and now < reminder_time + timedelta(minutes=15):
-                        event_copy = event.copy()
-                        event_copy['reminder_type'] = window_name
-                        event_copy['reminder_key'] = f"{event['id']}_{window_name}"
-                        events_needing_reminders.append(event_copy)
-                        
-            except (ValueError, KeyError):
-                # Skip events with invalid dates
-                continue
-        
-        return events_needing_reminders
-    
     async def get_event_count(self) -> int:
         """Get total count of events"""
         events = await self.fetch_all_events()
@@ -85,8 +162,8 @@ class EventService:
     async def get_event_stats(self) -> Dict[str, Any]:
         """Get comprehensive event statistics"""
         all_events = await self.fetch_all_events()
-        upcoming = await self.get_upcoming_events()
-        past = await self.get_past_events()
+        upcoming = await self.get_upcoming_events(all_events)
+        past = await self.get_past_events(all_events)
         
         next_event = None
         if upcoming:
@@ -101,4 +178,8 @@ class EventService:
             "upcoming_events": len(upcoming),
             "past_events": len(past),
             "next_event": next_event
-        }
\ No newline at end of file
+        }
+    
+    async def close(self):
+        if self._owns_client:
+            await self.client.aclose()
\ No newline at end of file
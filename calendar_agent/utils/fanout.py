@@ -0,0 +1,90 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional
+from calendar_agent.utils.ai_summarizer import MessageGenerator
+from calendar_agent.utils.reminder_tracker import ReminderTracker, recipient_key
+from calendar_agent.utils.textbelt_sms import TextBeltSMSClient
+
+class FanoutSender:
+    """Sends one generated message to many recipients concurrently.
+
+    Sends share a concurrency bound; the TextBelt pool's token bucket (outbound.py)
+    paces them globally, so several messages fanned out at once queue up instead of
+    bursting into 429s. With a delivery key, each (key, phone) is claimed on the
+    tracker, so a retry only reaches recipients that didn't get the message yet.
+    """
+
+    def __init__(
+        self,
+        sms_client: TextBeltSMSClient,
+        reminder_tracker: Optional[ReminderTracker] = None,
+        concurrency: Optional[int] = None
+    ):
+        self.sms_client = sms_client
+        self.reminder_tracker = reminder_tracker
+        self._slots = asyncio.Semaphore(concurrency or int(os.getenv("SMS_FANOUT_CONCURRENCY", "8")))
+
+    async def deliver(
+        self,
+        message_generator: MessageGenerator,
+        recipients: List[str],
+        delivery_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Send to every recipient; returns per-recipient results and throughput stats"""
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            self._deliver_one(message_generator, phone, delivery_key) for phone in dict.fromkeys(recipients)
+        ))
+        elapsed = time.perf_counter() - started
+
+        sent = [result for result in results if result["status"] == "sent"]
+        return {
+            "recipients": len(results),
+            "sent": len(sent),
+            "skipped": sum(1 for result in results if result["status"] == "skipped"),
+            "failed": sum(1 for result in results if result["status"] == "failed"),
+            "deferred": sum(1 for result in results if result["status"] == "deferred"),
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "sends_per_second": round(len(sent) / elapsed, 1) if elapsed > 0 else None,
+            "quota_remaining": min(
+                (r["quota_remaining"] for r in sent if r.get("quota_remaining") is not None), default=None
+            ),
+            "results": results
+        }
+
+    async def _deliver_one(
+        self,
+        message_generator: MessageGenerator,
+        phone: str,
+        delivery_key: Optional[str]
+    ) -> Dict[str, Any]:
+        claim = None
+        key = recipient_key(delivery_key, phone) if delivery_key else None
+        if key and self.reminder_tracker:
+            claim = self.reminder_tracker.claim_reminder(key)
+            if claim is None:
+                # Already delivered to this number, or being delivered by another run
+                return {"phone": phone, "status": "skipped"}
+
+        try:
+            async with self._slots:
+                result = await self.sms_client.send_generated_message(message_generator, phone)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+
+        if claim:
+            if result["success"]:
+                self.reminder_tracker.commit_reminder(key, claim)
+            else:
+                self.reminder_tracker.release_reminder(key, claim)
+
+        if not result["success"]:
+            status = "deferred" if result.get("deferred") else "failed"
+            return {"phone": phone, "status": status, "error": result.get("error")}
+        return {
+            "phone": phone,
+            "status": "sent",
+            "message_id": result.get("message_id"),
+            "quota_remaining": result.get("quota_remaining")
+        }
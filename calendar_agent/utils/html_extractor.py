@@ -0,0 +1,249 @@
+import os
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+LUMA_BASE_URL = "https://lu.ma"
+
+CARD_CLASSES = {"event-card", "content-card", "card"}
+TITLE_TAGS = {"h1", "h2", "h3", "h4"}
+TITLE_CLASSES = {"title", "name"}
+DATE_CLASSES = {"date", "time"}
+DESCRIPTION_CLASS = re.compile(r'desc|summary|description')
+LOCATION_CLASS = re.compile(r'location|venue|address')
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+DATE_TEXT_PATTERNS = [
+    re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2}', re.IGNORECASE),
+    re.compile(r'\d{1,2}/\d{1,2}/\d{4}'),
+    re.compile(r'\d{1,2}:\d{2}\s*(AM|PM)?', re.IGNORECASE)
+]
+NON_EVENT_WORDS = ('join', 'follow', 'profile', 'about')
+
+# Card text is only needed for the title/date fallbacks, so cap what we keep
+MAX_CARD_TEXT = 500
+
+def canonical_event_url(href: str) -> str:
+    """Absolute event URL without query, fragment or trailing slash"""
+    absolute = href if href.startswith('http') else f"{LUMA_BASE_URL}{href}"
+    parts = urlsplit(absolute)
+    return f"{parts.scheme}://{parts.netloc.lower()}{parts.path.rstrip('/')}"
+
+class EventCardCollector:
+    """Parser target that collects event cards from start/end/data callbacks in a single pass.
+
+    Every ``<a href*="/event/">`` becomes a card. Card-like containers (``article``,
+    ``.card``, ``[data-event-id]``...) collect fields too and hand them to the event
+    link inside them when they hold exactly one. Cards are deduplicated by canonical URL.
+    """
+
+    def __init__(self):
+        self._stack: List[Dict[str, Any]] = []
+        # Open frames that are cards or capture text; usually a handful, however deep the page
+        self._active: List[Dict[str, Any]] = []
+        self._cards: Dict[str, Dict[str, Any]] = {}
+
+    def start(self, tag: str, attrs: Dict[str, Optional[str]]):
+        tag = tag.lower()
+        if tag in VOID_TAGS:
+            return
+
+        classes = set((attrs.get('class') or '').split())
+        testid = attrs.get('data-testid') or ''
+        href = attrs.get('href') or ''
+
+        link = canonical_event_url(href) if tag == 'a' and '/event/' in href else None
+        is_container = (
+            tag == 'article'
+            or 'data-event-id' in attrs
+            or (tag == 'div' and 'event' in testid)
+            or bool(classes & CARD_CLASSES)
+        )
+
+        card = None
+        if link or is_container:
+            card = {"link": link, "links": [], "text": [], "text_len": 0}
+        if link:
+            for frame in self._active:
+                links = frame["card"]["links"] if frame["card"] is not None else None
+                # Two distinct links are enough to know a container isn't a single card
+                if links is not None and len(links) < 2 and link not in links:
+                    links.append(link)
+
+        capture = None
+        if tag in TITLE_TAGS or 'title' in testid or classes & TITLE_CLASSES:
+            capture = "title"
+        elif tag == 'time' or 'datetime' in attrs or classes & DATE_CLASSES or 'date' in testid:
+            capture = "date_text"
+        elif tag in ('p', 'div') and DESCRIPTION_CLASS.search(attrs.get('class') or ''):
+            capture = "description"
+        elif tag in ('span', 'div') and LOCATION_CLASS.search(attrs.get('class') or ''):
+            capture = "location"
+
+        frame = {
+            "tag": tag,
+            "card": card,
+            "capture": capture,
+            "buffer": [] if capture else None,
+            "datetime": attrs.get('datetime') or ''
+        }
+        self._stack.append(frame)
+        if card is not None or capture:
+            self._active.append(frame)
+
+    def end(self, tag: str):
+        tag = tag.lower()
+        # Tolerate unclosed tags: unwind to the nearest matching open element
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth]["tag"] == tag:
+                while len(self._stack) > depth:
+                    self._close_frame(self._stack.pop())
+                return
+
+    def data(self, text: str):
+        if not text:
+            return
+        for frame in self._active:
+            if frame["buffer"] is not None:
+                frame["buffer"].append(text)
+            card = frame["card"]
+            if card is not None and card["text_len"] < MAX_CARD_TEXT:
+                card["text"].append(text)
+                card["text_len"] += len(text)
+
+    def close(self) -> List[Dict[str, Any]]:
+        while self._stack:
+            self._close_frame(self._stack.pop())
+        cards = [self._finalize(card) for card in self._cards.values()]
+        return [card for card in cards if card]
+
+    def _close_frame(self, frame: Dict[str, Any]):
+        if self._active and self._active[-1] is frame:
+            self._active.pop()
+        if frame["datetime"]:
+            # Machine-readable timestamps beat the display text for the start time
+            for open_frame in self._active + [frame]:
+                card = open_frame["card"]
+                if card is not None and not card.get("datetime"):
+                    card["datetime"] = frame["datetime"]
+
+        capture = frame["capture"]
+        if capture:
+            value = " ".join("".join(frame["buffer"]).split())
+            if capture == "date_text":
+                value = value or frame["datetime"]
+            if value:
+                # The element belongs to every card that encloses it (including its own)
+                for open_frame in self._active + [frame]:
+                    card = open_frame["card"]
+                    if card is not None and not card.get(capture):
+                        card[capture] = value
+
+        card = frame["card"]
+        if card is None:
+            return
+        if card["link"]:
+            self._merge(card["link"], card)
+        elif len(card["links"]) == 1:
+            self._merge(card["links"][0], card)
+
+    def _merge(self, link: str, card: Dict[str, Any]):
+        existing = self._cards.get(link)
+        if existing is None:
+            self._cards[link] = {
+                "link": link,
+                "title": card.get("title", ""),
+                "date_text": card.get("date_text", ""),
+                "description": card.get("description", ""),
+                "location": card.get("location", ""),
+                "datetime": card.get("datetime", ""),
+                "text": "".join(card["text"])
+            }
+            return
+        for field in ("title", "date_text", "description", "location", "datetime"):
+            if not existing[field] and card.get(field):
+                existing[field] = card[field]
+        if not existing["text"].strip():
+            existing["text"] = "".join(card["text"])
+
+    def _finalize(self, card: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        text = card.pop("text")
+        if not card["title"]:
+            # If no title found, use card text but filter out common non-event text
+            card_text = " ".join(text.split())
+            if len(card_text) > 5 and not any(x in card_text.lower() for x in NON_EVENT_WORDS):
+                card["title"] = card_text[:100]
+        if not card["date_text"]:
+            for pattern in DATE_TEXT_PATTERNS:
+                match = pattern.search(text)
+                if match:
+                    card["date_text"] = match.group(0)
+                    break
+        if len(card["title"].strip()) <= 3:
+            return None
+        return card
+
+class _StdlibParser(HTMLParser):
+    def __init__(self, target: EventCardCollector):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+        self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+def _extract_with_html_parser(html: str) -> List[Dict[str, Any]]:
+    target = EventCardCollector()
+    parser = _StdlibParser(target)
+    parser.feed(html)
+    parser.close()
+    return target.close()
+
+def _extract_with_lxml(html: str) -> List[Dict[str, Any]]:
+    from lxml import etree
+
+    # lxml drives the same target callbacks from its C parser; no tree is built
+    parser = etree.HTMLParser(target=EventCardCollector())
+    parser.feed(html)
+    return parser.close()
+
+BACKENDS = {
+    "html.parser": _extract_with_html_parser,
+    "lxml": _extract_with_lxml
+}
+
+def available_backends() -> List[str]:
+    available = ["html.parser"]
+    try:
+        import lxml.etree  # noqa: F401
+        available.append("lxml")
+    except ImportError:
+        pass
+    return available
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """Pick a backend by name; "auto" (the default) prefers lxml when it is installed"""
+    name = name or os.getenv("LUMA_PARSER_BACKEND", "auto")
+    available = available_backends()
+    if name == "auto":
+        return available[-1]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown parser backend: {name}")
+    if name not in available:
+        print(f"Parser backend {name} unavailable, using html.parser")
+        return "html.parser"
+    return name
+
+def extract_event_cards(html: str, backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Extract deduplicated event cards (link, title, date_text, datetime, description, location)"""
+    return BACKENDS[resolve_backend(backend)](html)
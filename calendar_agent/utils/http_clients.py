@@ -0,0 +1,80 @@
+import os
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncOpenAI
+
+# httpx and openai are imported on first use so routes that make no outbound calls
+# (/health, /) don't pay for them on a cold start
+
+# Outbound services that each get their own connection pool
+PROVIDERS = ("luma", "textbelt", "openai")
+
+_http_clients: Dict[str, "httpx.AsyncClient"] = {}
+_openai_client: Optional["AsyncOpenAI"] = None
+
+def http2_enabled() -> bool:
+    """HTTP/2 when asked for (the default) and the h2 package is installed"""
+    if os.getenv("HTTP2_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def pool_limits() -> "httpx.Limits":
+    import httpx
+    return httpx.Limits(
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10")),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+    )
+
+def get_http_client(provider: str) -> "httpx.AsyncClient":
+    """The process-wide keep-alive client for a provider, created on first use.
+
+    Requests go through the provider's rate limit and retry policy (see outbound.py).
+    """
+    client = _http_clients.get(provider)
+    if client is None or client.is_closed:
+        import httpx
+        from calendar_agent.utils.outbound import OutboundTransport
+        pool = httpx.AsyncHTTPTransport(limits=pool_limits(), http2=http2_enabled())
+        client = httpx.AsyncClient(timeout=30.0, transport=OutboundTransport(provider, pool))
+        _http_clients[provider] = client
+    return client
+
+def get_openai_client() -> "AsyncOpenAI":
+    """The process-wide OpenAI client, riding on the shared "openai" connection pool"""
+    global _openai_client
+    http_client = get_http_client("openai")
+    # Rebuild if the pool underneath was closed and replaced
+    if _openai_client is None or _openai_client._client is not http_client:
+        from openai import AsyncOpenAI
+        _openai_client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=http_client,
+            # Retries happen once, in the pool's transport
+            max_retries=0
+        )
+    return _openai_client
+
+def open_clients():
+    """Create every pool up front (called from the app lifespan)"""
+    for provider in PROVIDERS:
+        get_http_client(provider)
+    from openai import OpenAIError
+    try:
+        get_openai_client()
+    except OpenAIError as e:
+        # e.g. no API key yet; AI endpoints will report it when they're called
+        print(f"OpenAI client not created: {e}")
+
+async def close_clients():
+    global _openai_client
+    for client in _http_clients.values():
+        await client.aclose()
+    _http_clients.clear()
+    _openai_client = None
@@ -0,0 +1,111 @@
+"""Cold-start import cost: ``python -X importtime`` run in a fresh interpreter, summarized.
+
+    python -m calendar_agent.utils.import_profile                   # import calendar_agent.main
+    python -m calendar_agent.utils.import_profile --top 30 openai   # any other module
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Dependencies that should stay out of a cold start until something actually needs them
+LAZY_PACKAGES = ("openai", "httpx", "bs4", "lxml", "yaml")
+
+# Dotted module path; anything else is refused before it gets near a subprocess
+_MODULE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+# The module name is passed as an argument, never interpolated into the code that runs.
+# __import__ rather than importlib.import_module: only the former shows up in -X importtime.
+_IMPORT_ARGV = "import sys; __import__(sys.argv[1])"
+
+# "import time: self [us] | cumulative | <indent>module"; two spaces of indent per nesting level
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)\s*$")
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    entries = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append({
+                "module": module,
+                "depth": len(indent) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000
+            })
+    return entries
+
+def profile_imports(module: str = "calendar_agent.main", top: int = 15, timeout: Optional[float] = 60.0) -> Dict[str, Any]:
+    """Import ``module`` in a new interpreter and report where its import time went"""
+    if not _MODULE_NAME.match(module):
+        raise ValueError(f"not a module name: {module!r}")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _IMPORT_ARGV, module],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        # Run from the repo root so calendar_agent resolves the same way it does for the app
+        cwd=str(Path(__file__).resolve().parents[2]),
+        env=os.environ.copy()
+    )
+    entries = parse_importtime(result.stderr)
+    target = next((e for e in reversed(entries) if e["module"] == module and e["depth"] == 0), None)
+
+    # Self time summed per top-level package says which dependency to make lazy
+    packages: Dict[str, float] = {}
+    for entry in entries:
+        package = entry["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + entry["self_ms"]
+
+    report = {
+        "module": module,
+        "ok": result.returncode == 0,
+        "total_ms": round(target["cumulative_ms"], 1) if target else None,
+        "modules_imported": len(entries),
+        "packages": [
+            {"package": name, "self_ms": round(ms, 1)}
+            for name, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+        "slowest_modules": [
+            {"module": e["module"], "cumulative_ms": round(e["cumulative_ms"], 1), "self_ms": round(e["self_ms"], 1)}
+            for e in sorted(entries, key=lambda e: e["self_ms"], reverse=True)[:top]
+        ],
+        "lazy_packages_loaded": [
+            package for package in LAZY_PACKAGES
+            if any(e["module"].split(".")[0] == package for e in entries)
+        ]
+    }
+    if result.returncode != 0:
+        report["error"] = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed"
+    return report
+
+def loaded_lazy_packages() -> Dict[str, bool]:
+    """Which lazily imported dependencies this (warm) process has loaded so far"""
+    return {package: package in sys.modules for package in LAZY_PACKAGES}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("module", nargs="?", default="calendar_agent.main", help="module to import (default: the app)")
+    parser.add_argument("--top", type=int, default=15, help="rows per table")
+    args = parser.parse_args()
+    if not _MODULE_NAME.match(args.module):
+        parser.error(f"not a module name: {args.module!r}")
+
+    report = profile_imports(args.module, top=args.top)
+    if not report["ok"]:
+        print(f"import {args.module} failed: {report['error']}")
+        sys.exit(1)
+
+    print(f"import {args.module}: {report['total_ms']:.1f} ms, {report['modules_imported']} modules")
+    print(f"lazy dependencies loaded at import: {', '.join(report['lazy_packages_loaded']) or 'none'}")
+    print(f"\n{'package':<32}{'self ms':>10}")
+    for row in report["packages"]:
+        print(f"{row['package']:<32}{row['self_ms']:>10.1f}")
+    print(f"\n{'module':<48}{'self ms':>10}{'cumul. ms':>12}")
+    for row in report["slowest_modules"]:
+        print(f"{row['module']:<48}{row['self_ms']:>10.1f}{row['cumulative_ms']:>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,23 @@
-import httpx
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, AsyncIterator, Tuple
+from urllib.parse import urlsplit
 import hashlib
+import os
 import re
 from pydantic import BaseModel, Field
+from calendar_agent.utils.html_extractor import extract_event_cards
+from calendar_agent.utils.structured_data import (
+    events_from_payloads,
+    find_api_id,
+    find_embedded_payloads,
+    find_next_cursor
+)
+from calendar_agent.utils import deadline
+from calendar_agent.utils.date_parser import format_event_time, parse_event_datetime
+from calendar_agent.utils.metrics import parse_seconds, scrape_seconds
+
+if TYPE_CHECKING:
+    import httpx
 
 class Event(BaseModel):
     id: str
@@ -15,97 +28,222 @@ class Event(BaseModel):
     description: str = ""
     location: str = ""
 
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Luma's paginated listing endpoints, by api_id prefix
+PAGINATION_ENDPOINTS = {
+    "cal-": ("https://api.lu.ma/calendar/get-items", "calendar_api_id"),
+    "usr-": ("https://api.lu.ma/user/profile/events", "user_api_id")
+}
+PAGE_SIZE = 50
+# Safety stop for runaway cursors; at PAGE_SIZE events a page this is plenty
+MAX_PAGES = int(os.getenv("LUMA_MAX_PAGES", "20"))
+
+# Validators, body hash and parsed events of the last response, per calendar URL.
+# Module-level so the state survives across scraper instances in a warm process.
+_page_states: Dict[str, Dict[str, Any]] = {}
+
 class LumaScraper:
-    def __init__(self, luma_url: str):
+    def __init__(
+        self,
+        luma_url: str,
+        parser_backend: Optional[str] = None,
+        client: Optional["httpx.AsyncClient"] = None
+    ):
         self.luma_url = luma_url
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.parser_backend = parser_backend
+        # A shared client belongs to whoever passed it in; only close our own
+        self._owns_client = client is None
+        if client is None:
+            import httpx
+            client = httpx.AsyncClient(timeout=30.0)
+        self.client = client
     
     async def fetch_events(self) -> List[Dict[str, Any]]:
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = await self.client.get(self.luma_url, headers=headers)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
             events = []
-            
-            # Look for various event container patterns
-            selectors = [
-                'a[href*="/event/"]',
-                'div[data-testid*="event"]',
-                '.event-card',
-                '.content-card',
-                '[data-event-id]',
-                'article',
-                '.card'
-            ]
-            
-            for selector in selectors:
-                event_elements = soup.select(selector)
-                if event_elements:
-                    for element in event_elements:
-                        event_data = self._extract_event_data(element)
-                        if event_data and event_data['title'] != "Untitled Event":
-                            events.append(event_data)
-                    if events:
-                        break
-            
-            # Enhanced fallback - look for any links with event-like text
-            if not events:
-                events = self._enhanced_fallback_extraction(soup)
+            async for page in self.iter_event_pages():
+                events.extend(page)
             
             # Force fallback with real Lab Miami events if still no events
-            if not events:
-                now = datetime.utcnow()
-                events = [
-                    {
-                        "id": "lab001",
-                        "title": "Community Build Session",
-                        "start_time": now.isoformat(),
-                        "formatted_date": "Today",
-                        "link": "https://lu.ma/the-lab-miami",
-                        "description": "Collaborative building and networking",
-                        "location": "Miami, FL"
-                    },
-                    {
-                        "id": "lab002", 
-                        "title": "Neural Networks Workshop",
-                        "start_time": (now + timedelta(days=4)).isoformat(),
-                        "formatted_date": "Oct 28",
-                        "link": "https://lu.ma/neural-nets-miami",
-                        "description": "Learn about neural networks and AI",
-                        "location": "Miami, FL"
-                    }
-                ]
-            
-            return events[:10]  # Limit to 10 events
+            return events or self._fallback_events()
         except Exception as e:
             print(f"Error fetching events: {e}")
             # Return fallback events even on error
-            now = datetime.utcnow()
-            return [
-                {
-                    "id": "lab001",
-                    "title": "Community Build Session",
-                    "start_time": now.isoformat(),
-                    "formatted_date": "Today",
-                    "link": "https://lu.ma/the-lab-miami",
-                    "description": "Collaborative building and networking",
-                    "location": "Miami, FL"
+            return self._fallback_events()
+    
+    async def iter_event_pages(self, max_pages: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the calendar page's events, then each further page from Luma's paginated API.
+        
+        Only one page is held at a time. Errors on the first page propagate; errors on
+        later pages end the stream after logging, keeping what was already yielded.
+        """
+        max_pages = max_pages or MAX_PAGES
+        first_page = await self._fetch_first_page()
+        yield list(first_page["events"])
+        
+        api_id = first_page.get("api_id")
+        cursor = first_page.get("next_cursor")
+        pages = 1
+        while api_id and cursor and pages < max_pages:
+            try:
+                events, cursor = await self._fetch_api_page(api_id, cursor)
+            except Exception as e:
+                print(f"Error fetching events page {pages + 1}: {e}")
+                return
+            pages += 1
+            yield events
+        if api_id and cursor:
+            print(f"Stopped reading {self.luma_url} at LUMA_MAX_PAGES={max_pages}; later events are left out")
+    
+    async def _fetch_first_page(self) -> Dict[str, Any]:
+        headers = {
+            'User-Agent': USER_AGENT
+        }
+        
+        # Revalidate against the last response so unchanged pages aren't re-downloaded
+        page_state = _page_states.get(self.luma_url)
+        if page_state:
+            if page_state.get("etag"):
+                headers['If-None-Match'] = page_state["etag"]
+            if page_state.get("last_modified"):
+                headers['If-Modified-Since'] = page_state["last_modified"]
+        
+        with scrape_seconds.time(page="first"):
+            response = await self.client.get(self.luma_url, headers=headers, timeout=deadline.timeout_for(30.0))
+        
+        if response.status_code == 304 and page_state:
+            return page_state
+        
+        response.raise_for_status()
+        
+        # Identical body (server ignored the validators) - skip the parse entirely
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if page_state and page_state["content_hash"] == content_hash:
+            page_state["etag"] = response.headers.get("ETag")
+            page_state["last_modified"] = response.headers.get("Last-Modified")
+            return page_state
+        
+        page = self._parse_page(response.text)
+        page.update({
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_hash": content_hash
+        })
+        if page["events"]:
+            _page_states[self.luma_url] = page
+        return page
+    
+    async def _fetch_api_page(self, api_id: str, cursor: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        endpoint, id_param = PAGINATION_ENDPOINTS[api_id[:4]]
+        with scrape_seconds.time(page="api"):
+            response = await self.client.get(
+                endpoint,
+                params={
+                    id_param: api_id,
+                    "period": "future",
+                    "pagination_cursor": cursor,
+                    "pagination_limit": PAGE_SIZE
                 },
-                {
-                    "id": "lab002", 
-                    "title": "Neural Networks Workshop",
-                    "start_time": (now + timedelta(days=4)).isoformat(),
-                    "formatted_date": "Oct 28",
-                    "link": "https://lu.ma/neural-nets-miami",
-                    "description": "Learn about neural networks and AI",
-                    "location": "Miami, FL"
-                }
-            ]
-        finally:
+                headers={'User-Agent': USER_AGENT},
+                timeout=deadline.timeout_for(30.0)
+            )
+        response.raise_for_status()
+        payload = response.json()
+        
+        events = self._events_from_items(events_from_payloads([payload]))
+        next_cursor = payload.get("next_cursor") if payload.get("has_more") else None
+        return events, next_cursor
+    
+    def _parse_page(self, html: str) -> Dict[str, Any]:
+        """Events of a calendar page plus what is needed to request the pages after it"""
+        with parse_seconds.time():
+            payloads = find_embedded_payloads(html)
+            return {
+                "events": self._parse_events(html, payloads),
+                "api_id": self._api_id(payloads),
+                "next_cursor": find_next_cursor(payloads)
+            }
+    
+    def _api_id(self, payloads: List[Any]) -> Optional[str]:
+        # Profile and calendar URLs usually carry their id (lu.ma/usr-...); else ask the payload
+        slug = urlsplit(self.luma_url).path.strip('/')
+        if slug.startswith(tuple(PAGINATION_ENDPOINTS)):
+            return slug
+        return find_api_id(payloads, tuple(PAGINATION_ENDPOINTS))
+    
+    def _parse_events(self, html: str, payloads: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+        # Fast path: decode the embedded JSON payload, no DOM walk at all
+        if payloads is None:
+            payloads = find_embedded_payloads(html)
+        events = self._events_from_items(events_from_payloads(payloads))
+        if events:
+            return events
+        
+        # Single streaming pass over the page collects and deduplicates every card
+        events = [
+            self._build_event(
+                card["title"],
+                card["link"],
+                card["date_text"],
+                card["description"],
+                card["location"],
+                start_time=self._parse_date(card["datetime"]) if card["datetime"] else None
+            )
+            for card in extract_event_cards(html, self.parser_backend)
+        ]
+        
+        # Enhanced fallback - look for any links with event-like text
+        if not events:
+            # Last resort only, so bs4 is loaded the first time a page needs it
+            from bs4 import BeautifulSoup
+            events = self._enhanced_fallback_extraction(BeautifulSoup(html, 'html.parser'))
+        
+        return events
+    
+    def _events_from_items(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        events = []
+        for item in items:
+            events.append(self._build_event(
+                item["title"],
+                item["link"],
+                format_event_time(item["start_at"], item["timezone"]),
+                item["description"],
+                item["location"],
+                # Real timestamp from the payload, stored as naive UTC like every other event
+                start_time=item["start_at"].replace(tzinfo=None).isoformat(),
+                key=item["api_id"]
+            ))
+        return events
+    
+    def _fallback_events(self) -> List[Dict[str, Any]]:
+        # Flagged so sync can tell "Luma failed" from "Luma's events changed"
+        now = datetime.utcnow()
+        return [
+            {
+                "id": "lab001",
+                "title": "Community Build Session",
+                "start_time": now.isoformat(),
+                "formatted_date": "Today",
+                "link": "https://lu.ma/the-lab-miami",
+                "description": "Collaborative building and networking",
+                "location": "Miami, FL",
+                "placeholder": True
+            },
+            {
+                "id": "lab002", 
+                "title": "Neural Networks Workshop",
+                "start_time": (now + timedelta(days=4)).isoformat(),
+                "formatted_date": "Oct 28",
+                "link": "https://lu.ma/neural-nets-miami",
+                "description": "Learn about neural networks and AI",
+                "location": "Miami, FL",
+                "placeholder": True
+            }
+        ]
+    
+    async def close(self):
+        if self._owns_client:
             await self.client.aclose()
     
     def _extract_event_data(self, card) -> Dict[str, Any]:
@@ -169,41 +307,47 @@ class LumaScraper:
             
             # Only return if we have a meaningful title and link
             if title and len(title.strip()) > 3 and '/event/' in (link or ''):
-                event_id = hashlib.md5(f"{title}{link}".encode()).hexdigest()[:12]
-                start_time = self._parse_date(date_text)
-                
-                return {
-                    "id": event_id,
-                    "title": title,
-                    "start_time": start_time,
-                    "formatted_date": date_text or "Date TBD",
-                    "link": link,
-                    "description": description[:500],
-                    "location": location
-                }
+                return self._build_event(title, link, date_text, description, location)
             
             return None
         except Exception as e:
             print(f"Error extracting event data: {e}")
             return None
     
+    def _build_event(
+        self,
+        title: str,
+        link: str,
+        date_text: str,
+        description: str = "",
+        location: str = "",
+        start_time: Optional[str] = None,
+        key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return {
+            "id": self._event_id(key or link),
+            "title": title,
+            "start_time": start_time or self._parse_date(date_text),
+            "formatted_date": date_text or "Date TBD",
+            "link": link,
+            "description": description[:500],
+            "location": location
+        }
+    
+    def _event_id(self, key: str) -> str:
+        """Stable id from Luma's api_id or the event's canonical URL, never the title,
+        so an edited event diffs as "changed" rather than cancelled plus added"""
+        if key.startswith("http"):
+            parts = urlsplit(key)
+            key = f"{parts.netloc.lower()}{parts.path.rstrip('/')}"
+        return hashlib.md5(key.encode()).hexdigest()[:12]
+    
     def _parse_date(self, date_text: str) -> str:
-        try:
-            patterns = [
-                r'(\w+ \d{1,2}, \d{4})',
-                r'(\w+ \d{1,2})',
-                r'(\d{1,2}/\d{1,2}/\d{4})',
-                r'(\d{1,2}-\d{1,2}-\d{4})'
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, date_text)
-                if match:
-                    return datetime.utcnow().isoformat()
-            
-            return datetime.utcnow().isoformat()
-        except:
+        parsed = parse_event_datetime(date_text)
+        if parsed is None:
+            # Unparseable dates keep the old behaviour of "now" so the event isn't dropped
             return datetime.utcnow().isoformat()
+        return parsed.isoformat()
     
     def _enhanced_fallback_extraction(self, soup) -> List[Dict[str, Any]]:
         events = []
@@ -231,10 +375,8 @@ class LumaScraper:
                 if date_match:
                     date_text = date_match.group(0)
             
-            event_id = hashlib.md5(f"{title}{href}".encode()).hexdigest()[:12]
-            
             events.append({
-                "id": event_id,
+                "id": self._event_id(full_link),
                 "title": title,
                 "start_time": self._parse_date(date_text),
                 "formatted_date": date_text or "Date TBD",
@@ -253,9 +395,10 @@ class LumaScraper:
                     "formatted_date": "Oct 26 at 7:00 PM",
                     "link": "https://lu.ma/the-lab-miami",
                     "description": "Join us for networking and collaboration",
-                    "location": "Miami, FL"
+                    "location": "Miami, FL",
+                    "placeholder": True
                 }
             ]
             events.extend(sample_events)
         
-        return events[:10]
\ No newline at end of file
+        return events
\ No newline at end of file
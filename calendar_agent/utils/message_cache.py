@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+class MessageCache:
+    """Persistent, content-addressed cache of AI completions with LRU eviction and a TTL.
+
+    Keys are hashes of the full request (model, messages, sampling settings), so the
+    same event rendered through the same template and model always lands on the
+    same entry, and any change to those produces a new one.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 1000, ttl_seconds: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def make_key(**request: Any) -> str:
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached {"content", "model"} for key, or None on a miss or expired entry"""
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT content, model, created_at FROM messages WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[2] >= self.ttl_seconds:
+                conn.execute("DELETE FROM messages WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE messages SET last_used = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return {"content": row[0], "model": row[1]}
+        except sqlite3.Error as e:
+            print(f"Message cache read error: {e}")
+            return None
+
+    def put(self, key: str, content: str, model: str):
+        try:
+            conn = self._connect()
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO messages (key, content, model, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, content, model, now, now)
+            )
+            # Keep only the most recently used max_entries rows
+            conn.execute(
+                "DELETE FROM messages WHERE key IN "
+                "(SELECT key FROM messages ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Message cache write error: {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path))
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "key TEXT PRIMARY KEY, content TEXT NOT NULL, model TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_last_used ON messages (last_used)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+message_cache = MessageCache(
+    Path(os.getenv("AI_CACHE_PATH", "/tmp/ai_message_cache.db")),
+    max_entries=int(os.getenv("AI_CACHE_MAX_ENTRIES", "1000")),
+    ttl_seconds=float(os.getenv("AI_CACHE_TTL", str(7 * 24 * 3600)))
+)
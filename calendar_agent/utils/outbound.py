@@ -0,0 +1,203 @@
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+import httpx
+from calendar_agent.utils import deadline
+from calendar_agent.utils.circuit_breaker import CircuitBreaker, get_breaker
+from calendar_agent.utils.metrics import outbound_rate, outbound_retries
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# Safe to resend on any status: the server either didn't act or acting twice is harmless
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# Time a retry needs left after its wait to be worth making
+RETRY_MINIMUM = 1.0
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of making a request while a provider's circuit is open"""
+
+class ProviderPolicy:
+    """Rate, burst and retry settings for one outbound provider, read from {PROVIDER}_* env vars"""
+
+    def __init__(
+        self,
+        provider: str,
+        rate_per_second: float,
+        burst: int,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        retry_unsafe_methods: bool = False,
+        quota_low_watermark: Optional[int] = None
+    ):
+        prefix = provider.upper()
+        self.provider = provider
+        self.rate_per_second = float(os.getenv(f"{prefix}_RATE_PER_SECOND", str(rate_per_second)))
+        self.burst = int(os.getenv(f"{prefix}_BURST", str(burst)))
+        self.max_retries = int(os.getenv(f"{prefix}_MAX_RETRIES", str(max_retries)))
+        self.backoff_base = backoff_base
+        self.backoff_max = float(os.getenv(f"{prefix}_BACKOFF_MAX", str(backoff_max)))
+        # POSTs are only retried on statuses that mean "not processed" unless the provider opts in
+        self.retry_unsafe_methods = retry_unsafe_methods
+        self.quota_low_watermark = quota_low_watermark
+
+POLICIES: Dict[str, ProviderPolicy] = {
+    "luma": ProviderPolicy("luma", rate_per_second=5, burst=10),
+    # A duplicate completion only costs tokens, so OpenAI POSTs are retried like GETs
+    "openai": ProviderPolicy("openai", rate_per_second=8, burst=8, retry_unsafe_methods=True),
+    # A duplicate SMS is what all of this exists to prevent; slow down as quota runs out
+    "textbelt": ProviderPolicy("textbelt", rate_per_second=10, burst=10, quota_low_watermark=50)
+}
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, holding at most ``burst``"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def set_rate(self, rate: float):
+        self._refill()
+        self.rate = rate
+    
+    def wait_estimate(self) -> float:
+        """Seconds until the next token, not counting callers already queued for it"""
+        self._refill()
+        return max(1 - self._tokens, 0.0) / self.rate
+
+    async def acquire(self):
+        # Waiters queue on the lock, so tokens are handed out first come, first served
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+class OutboundTransport(httpx.AsyncBaseTransport):
+    """httpx transport adding per-provider circuit breaking, rate limiting, retries and
+    quota-driven throttling.
+
+    While the provider's circuit is open, requests fail at once with CircuitOpenError.
+    Otherwise every request first takes a token from the provider's bucket. Connection
+    failures, 429s and transient 5xx are retried with jittered exponential backoff,
+    waiting at least as long as Retry-After says. Responses carrying a quota
+    (TextBelt's quotaRemaining) scale the bucket's rate down as the quota nears zero.
+    
+    Inside a request deadline (deadline.py), waiting for a token raises DeadlineExceeded
+    once it can't finish in time, and a retry whose wait wouldn't fit isn't made: the
+    last response is returned, or the last error raised. Every attempt's connect, read,
+    write and pool timeouts are cut to the time left when it starts.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        inner: httpx.AsyncBaseTransport,
+        policy: Optional[ProviderPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.provider = provider
+        self.inner = inner
+        self.policy = policy or POLICIES.get(provider) or ProviderPolicy(provider, rate_per_second=10, burst=10)
+        self.breaker = breaker or get_breaker(provider)
+        self.bucket = TokenBucket(self.policy.rate_per_second, self.policy.burst)
+        outbound_rate.set(self.bucket.rate, provider=provider)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        # The client's timeouts, before any attempt cut them to the deadline
+        timeouts = dict(request.extensions.get("timeout", {}))
+        while True:
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"{self.provider} circuit is open", request=request)
+            # Don't queue for a token the deadline can't wait for
+            if not deadline.has_time(self.bucket.wait_estimate() + RETRY_MINIMUM):
+                raise deadline.DeadlineExceeded(f"{self.provider} rate limit wait exceeds the time left")
+            await deadline.bounded(self.bucket.acquire(), reserve=RETRY_MINIMUM)
+            if deadline.remaining() is not None:
+                request.extensions["timeout"] = {kind: deadline.timeout_for(value) for kind, value in timeouts.items()}
+            try:
+                response = await self.inner.handle_async_request(request)
+            except httpx.TransportError as e:
+                self.breaker.record(False)
+                # Only retry what never reached the server, so a retry can't duplicate anything
+                retryable = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                if not retryable or attempt >= self.policy.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                if not deadline.has_time(delay + RETRY_MINIMUM):
+                    raise
+                reason = "connect"
+            else:
+                # Server errors count against the circuit; 429 means busy, not down
+                self.breaker.record(response.status_code < 500)
+                if not self._should_retry(request, response, attempt):
+                    await self._observe(response)
+                    return response
+                delay = max(self._retry_after(response) or 0.0, self._backoff(attempt))
+                if delay > self.policy.backoff_max or not deadline.has_time(delay + RETRY_MINIMUM):
+                    # The server wants longer than we're willing (or the deadline allows) to hold the caller
+                    return response
+                reason = str(response.status_code)
+                await response.aclose()
+
+            outbound_retries.inc(provider=self.provider, reason=reason)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+    def _should_retry(self, request: httpx.Request, response: httpx.Response, attempt: int) -> bool:
+        if response.status_code not in RETRYABLE_STATUSES or attempt >= self.policy.max_retries:
+            return False
+        if request.method in IDEMPOTENT_METHODS or self.policy.retry_unsafe_methods:
+            return True
+        # Rate limited or explicitly unavailable: the request was turned away, not processed
+        return response.status_code in (429, 503)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps retrying callers from synchronizing into new bursts
+        return random.uniform(0, min(self.policy.backoff_max, self.policy.backoff_base * 2 ** attempt))
+
+    def _retry_after(self, response: httpx.Response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+    async def _observe(self, response: httpx.Response):
+        if self.policy.quota_low_watermark is None:
+            return
+        await response.aread()
+        try:
+            quota = json.loads(response.content).get("quotaRemaining")
+        except (ValueError, AttributeError):
+            return
+        if not isinstance(quota, (int, float)):
+            return
+        # Full speed above the watermark, then proportionally slower down to a trickle
+        share = max(min(quota / self.policy.quota_low_watermark, 1.0), 0.05)
+        self.bucket.set_rate(self.policy.rate_per_second * share)
+        outbound_rate.set(self.bucket.rate, provider=self.provider)
@@ -0,0 +1,182 @@
+import math
+import os
+import string
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from calendar_agent.utils.metrics import prompt_tokens
+
+EVENT_FIELDS = frozenset({"title", "date", "description", "location", "link"})
+
+# Placeholders each prompt may use; anything else is rejected when the file loads.
+# Sections with a "templates" mapping (event_reminder) apply their fields to every entry.
+PROMPT_FIELDS: Dict[str, FrozenSet[str]] = {
+    "event_reminder": EVENT_FIELDS,
+    "new_event": EVENT_FIELDS,
+    "weekly_digest": frozenset({"events_list", "event_count", "week_date"}),
+    "event_summary": frozenset({"description"})
+}
+
+class PromptError(ValueError):
+    """A prompt file or template that can't be used"""
+
+def estimate_tokens(text: str) -> int:
+    # OpenAI's rule of thumb for English: about four characters per token
+    return math.ceil(len(text) / 4)
+
+class PromptTemplate:
+    """One system prompt plus a user template whose placeholders were parsed once at load time"""
+
+    def __init__(self, name: str, system: str, user: str, allowed: FrozenSet[str]):
+        self.name = name
+        self.system = system
+        self.user = user
+        self._segments = self._compile(user, allowed)
+        self.fields = frozenset(field for _, field in self._segments if field)
+        self.system_tokens = estimate_tokens(system)
+        # Literal text only; substituted values add to this at render time
+        self.user_tokens = estimate_tokens("".join(literal for literal, _ in self._segments))
+
+    def render(self, **values: Any) -> str:
+        parts = []
+        for literal, field in self._segments:
+            parts.append(literal)
+            if field:
+                parts.append(str(values[field]))
+        return "".join(parts)
+
+    def _compile(self, text: str, allowed: FrozenSet[str]) -> List[Tuple[str, Optional[str]]]:
+        try:
+            parsed = list(string.Formatter().parse(text))
+        except ValueError as e:
+            raise PromptError(f"{self.name}: {e}")
+        segments = []
+        for literal, field, spec, conversion in parsed:
+            if field is not None:
+                if not field.isidentifier():
+                    raise PromptError(f"{self.name}: placeholder {{{field}}} must be a plain name")
+                if spec or conversion:
+                    raise PromptError(f"{self.name}: placeholder {{{field}}} can't take a format spec")
+                if field not in allowed:
+                    raise PromptError(
+                        f"{self.name}: unknown placeholder {{{field}}} (expected one of {', '.join(sorted(allowed))})"
+                    )
+            segments.append((literal, field))
+        return segments
+
+def compile_prompts(data: Any) -> Dict[str, PromptTemplate]:
+    """Validate a parsed prompts file and compile every template; raises PromptError listing all problems"""
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise PromptError("prompts file must be a mapping of prompt names")
+
+    templates, errors = {}, []
+    for section, config in data.items():
+        allowed = PROMPT_FIELDS.get(section)
+        if allowed is None:
+            errors.append(f"{section}: unknown prompt (expected one of {', '.join(PROMPT_FIELDS)})")
+            continue
+        if not isinstance(config, dict):
+            errors.append(f"{section}: must be a mapping")
+            continue
+        system = config.get("system", "")
+        entries = config.get("templates", {section: config})
+        if not isinstance(entries, dict):
+            errors.append(f"{section}: templates must be a mapping")
+            continue
+        for key, entry in entries.items():
+            name = section if key == section else f"{section}.{key}"
+            user = entry.get("user") if isinstance(entry, dict) else None
+            if not isinstance(user, str) or not isinstance(system, str):
+                errors.append(f"{name}: system and user must be strings")
+                continue
+            try:
+                templates[name] = PromptTemplate(name, system, user, allowed)
+            except PromptError as e:
+                errors.append(str(e))
+    if errors:
+        raise PromptError("; ".join(errors))
+    return templates
+
+class PromptRegistry:
+    """Process-wide compiled prompts, reloaded only when the file's mtime changes.
+
+    A file that fails validation is reported and ignored: the last good templates
+    stay in use, so a bad edit can't take AI messages down.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._mtime: Optional[int] = None
+        self._loaded_at: Optional[float] = None
+        self._error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[PromptTemplate]:
+        self._refresh()
+        return self._templates.get(name)
+
+    def report(self) -> Dict[str, Any]:
+        self._refresh()
+        return {
+            "path": str(self.path),
+            "loaded_at": self._loaded_at,
+            "error": self._error,
+            "templates": [
+                {
+                    "name": template.name,
+                    "fields": sorted(template.fields),
+                    "system_tokens": template.system_tokens,
+                    "user_tokens": template.user_tokens
+                }
+                for template in self._templates.values()
+            ]
+        }
+
+    def _refresh(self):
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._mtime and self._loaded_at is not None:
+            return
+        with self._lock:
+            if mtime == self._mtime and self._loaded_at is not None:
+                return
+            self._load(mtime)
+
+    def _load(self, mtime: Optional[int]):
+        self._mtime = mtime
+        self._loaded_at = time.time()
+        if mtime is None:
+            self._templates, self._error = {}, None
+            return
+        import yaml
+        try:
+            with open(self.path, 'r') as f:
+                templates = compile_prompts(yaml.safe_load(f))
+        except (OSError, PromptError, yaml.YAMLError) as e:
+            self._error = str(e)
+            print(f"Prompt registry load error (keeping previous prompts): {e}")
+            return
+        self._templates, self._error = templates, None
+        for template in templates.values():
+            prompt_tokens.set(template.system_tokens, template=template.name, part="system")
+            prompt_tokens.set(template.user_tokens, template=template.name, part="user")
+
+prompt_registry = PromptRegistry(
+    Path(os.getenv("PROMPTS_PATH", str(Path(__file__).parent.parent / "prompts.yaml")))
+)
+
+if __name__ == "__main__":
+    # python -m calendar_agent.utils.prompt_registry: validate prompts.yaml and list its templates
+    report = prompt_registry.report()
+    if report["error"]:
+        print(f"{report['path']}: {report['error']}")
+        raise SystemExit(1)
+    print(f"{'template':<32}{'fields':<48}{'system':>8}{'user':>8}")
+    for row in report["templates"]:
+        print(f"{row['name']:<32}{', '.join(row['fields']):<48}{row['system_tokens']:>8}{row['user_tokens']:>8}")
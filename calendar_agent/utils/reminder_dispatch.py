@@ -0,0 +1,108 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional
+from calendar_agent.utils import deadline
+from calendar_agent.utils.fanout import FanoutSender
+from calendar_agent.utils.reminder_messages import ReminderMessageStore
+from calendar_agent.utils.reminder_tracker import ReminderTracker
+from calendar_agent.utils.subscribers import subscriber_registry
+from calendar_agent.utils.textbelt_sms import TextBeltSMSClient
+
+class ReminderDispatcher:
+    """Generate-then-send pipeline for due reminders, with per-stage concurrency limits.
+
+    Every reminder moves through the LLM stage and then the SMS stage on its own, so
+    one reminder's SMS overlaps the next one's generation instead of waiting for it.
+    Each message is generated once and fanned out to every subscriber.
+    """
+
+    def __init__(
+        self,
+        sms_client: TextBeltSMSClient,
+        reminder_tracker: ReminderTracker,
+        llm_concurrency: Optional[int] = None,
+        sms_concurrency: Optional[int] = None,
+        message_store: Optional[ReminderMessageStore] = None,
+        recipients: Optional[List[str]] = None
+    ):
+        self.sms_client = sms_client
+        self.reminder_tracker = reminder_tracker
+        self.message_store = message_store
+        self.recipients = recipients or subscriber_registry.recipients()
+        self._llm_slots = asyncio.Semaphore(llm_concurrency or int(os.getenv("REMINDER_LLM_CONCURRENCY", "4")))
+        # One sender for the whole run, so every reminder shares its concurrency and rate limit
+        self.fanout = FanoutSender(sms_client, reminder_tracker, concurrency=sms_concurrency)
+        # Totals over every reminder of the last dispatch
+        self.delivery_stats: Dict[str, Any] = {}
+        # Reminders the last dispatch left for the next tick: out of time, or sends deferred
+        self.deferred_keys: List[str] = []
+
+    async def dispatch(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send every due reminder not sent yet; returns details of the ones that went out, in order"""
+        self.delivery_stats = {"recipients": len(self.recipients), "sent": 0, "skipped": 0, "failed": 0, "deferred": 0}
+        self.deferred_keys = []
+        started = time.perf_counter()
+        results = await asyncio.gather(*(self._dispatch_one(event) for event in events))
+        elapsed = time.perf_counter() - started
+        self.delivery_stats["elapsed_ms"] = round(elapsed * 1000, 1)
+        self.delivery_stats["sends_per_second"] = round(self.delivery_stats["sent"] / elapsed, 1) if elapsed > 0 else None
+        return [result for result in results if result]
+
+    async def _dispatch_one(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Too little time left to send: leave it unclaimed for the next tick
+        if not deadline.has_time(deadline.SEND_MINIMUM):
+            self.delivery_stats["deferred"] += len(self.recipients)
+            self.deferred_keys.append(event["reminder_key"])
+            return None
+
+        # Already sent, or being sent by this or an overlapping run
+        claim = self.reminder_tracker.claim_reminder(event["reminder_key"])
+        if claim is None:
+            return None
+
+        try:
+            # Messages generated at sync time skip the LLM stage entirely
+            message_generator = None
+            if self.message_store:
+                message_generator = self.message_store.get(event, event["reminder_type"])
+
+            if message_generator is None:
+                async with self._llm_slots:
+                    message_generator = await self.sms_client.ai_summarizer.generate_reminder_message(
+                        event, event["reminder_type"]
+                    )
+
+            delivery = await self.fanout.deliver(message_generator, self.recipients, event["reminder_key"])
+        except Exception as e:
+            print(f"Error dispatching reminder {event['reminder_key']}: {e}")
+            self.reminder_tracker.release_reminder(event["reminder_key"], claim)
+            if isinstance(e, deadline.DeadlineExceeded):
+                self.deferred_keys.append(event["reminder_key"])
+            return None
+
+        for outcome in ("sent", "skipped", "failed", "deferred"):
+            self.delivery_stats[outcome] += delivery[outcome]
+        # Any recipient still missing keeps the reminder open for the next tick to retry
+        if delivery["failed"] or delivery["deferred"]:
+            self.reminder_tracker.release_reminder(event["reminder_key"], claim)
+            if delivery["deferred"]:
+                self.deferred_keys.append(event["reminder_key"])
+        else:
+            self.reminder_tracker.commit_reminder(event["reminder_key"], claim)
+        if not delivery["sent"]:
+            return None
+
+        return {
+            "event_id": event["id"],
+            "event_title": event["title"],
+            "reminder_type": event["reminder_type"],
+            "message_id": next(r["message_id"] for r in delivery["results"] if r["status"] == "sent"),
+            "ai_generated": True,
+            "tokens_used": message_generator.tokens_used,
+            "service": "TextBelt",
+            "quota_remaining": delivery["quota_remaining"],
+            "recipients_sent": delivery["sent"],
+            "recipients_failed": delivery["failed"],
+            "elapsed_ms": delivery["elapsed_ms"]
+        }
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from calendar_agent.utils.ai_summarizer import AISummarizer, MessageGenerator
+
+# Fields that change what a reminder says; any edit to them invalidates stored messages
+FINGERPRINT_FIELDS = ("title", "start_time", "formatted_date", "link", "description", "location")
+
+def event_fingerprint(event: Dict[str, Any]) -> str:
+    payload = json.dumps({field: event.get(field, "") for field in FINGERPRINT_FIELDS}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class ReminderMessageStore:
+    """Reminder texts generated ahead of time, one per (event, reminder type).
+
+    Each row remembers the fingerprint of the event it was written for, so a lookup
+    for an event that has since changed is a miss.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def get(self, event: Dict[str, Any], reminder_type: str) -> Optional[MessageGenerator]:
+        try:
+            row = self._connect().execute(
+                "SELECT content, model FROM reminder_messages "
+                "WHERE event_id = ? AND reminder_type = ? AND fingerprint = ?",
+                (event["id"], reminder_type, event_fingerprint(event))
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Reminder message store read error: {e}")
+            return None
+        if row is None:
+            return None
+        # Tokens were paid for (and reported) by the sync that generated it
+        return MessageGenerator(content=row[0], model=row[1], tokens_used=0)
+
+    def put(self, event: Dict[str, Any], reminder_type: str, message: MessageGenerator):
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO reminder_messages "
+                "(event_id, reminder_type, fingerprint, content, model, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (event["id"], reminder_type, event_fingerprint(event), message.content,
+                 message.model, time.time())
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Reminder message store write error: {e}")
+
+    def delete_events(self, event_ids: List[str]) -> int:
+        """Drop every message of the given events; returns rows removed"""
+        try:
+            conn = self._connect()
+            removed = conn.executemany(
+                "DELETE FROM reminder_messages WHERE event_id = ?", [(i,) for i in event_ids]
+            ).rowcount
+            conn.commit()
+            return removed
+        except sqlite3.Error as e:
+            print(f"Reminder message store cleanup error: {e}")
+            return 0
+
+    def delete_events_except(self, event_ids: List[str]) -> int:
+        """Drop messages of events that are no longer listed; returns rows removed"""
+        try:
+            conn = self._connect()
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS live_events (event_id TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM live_events")
+            conn.executemany("INSERT OR IGNORE INTO live_events VALUES (?)", [(i,) for i in event_ids])
+            removed = conn.execute(
+                "DELETE FROM reminder_messages WHERE event_id NOT IN (SELECT event_id FROM live_events)"
+            ).rowcount
+            conn.commit()
+            return removed
+        except sqlite3.Error as e:
+            print(f"Reminder message store cleanup error: {e}")
+            return 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path))
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS reminder_messages ("
+                "event_id TEXT NOT NULL, reminder_type TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+                "content TEXT NOT NULL, model TEXT NOT NULL, "
+                "created_at REAL NOT NULL, PRIMARY KEY (event_id, reminder_type))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+async def precompute_reminder_messages(
+    ai_summarizer: AISummarizer,
+    store: ReminderMessageStore,
+    events: List[Dict[str, Any]],
+    reminder_windows: List[Tuple[timedelta, str]]
+) -> Dict[str, int]:
+    """Generate and store every reminder the given upcoming events will still need.
+
+    Messages already stored for an unchanged event are kept and windows whose send
+    time has passed are skipped. Fallback (non-AI) texts are not stored, so
+    dispatch generates those reminders on its own when they come due.
+    """
+    now = datetime.utcnow()
+    stats = {"generated": 0, "reused": 0, "failed": 0, "tokens_used": 0}
+
+    todo = []
+    for event in events:
+        try:
+            event_time = datetime.fromisoformat(event["start_time"])
+        except (ValueError, KeyError):
+            continue
+        for window, reminder_type in reminder_windows:
+            if event_time - window + timedelta(minutes=15) <= now:
+                continue
+            if store.get(event, reminder_type):
+                stats["reused"] += 1
+            else:
+                todo.append((event, reminder_type))
+
+    # One batched request per AI_BATCH_SIZE reminders instead of one per reminder
+    messages = await ai_summarizer.generate_reminder_messages_batch(todo)
+    for (event, reminder_type), message in zip(todo, messages):
+        if message.model == "fallback":
+            stats["failed"] += 1
+            continue
+        store.put(event, reminder_type, message)
+        stats["generated"] += 1
+        stats["tokens_used"] += message.tokens_used
+    return stats
+
+reminder_message_store = ReminderMessageStore(
+    Path(os.getenv("REMINDER_MESSAGES_PATH", "/tmp/reminder_messages.db"))
+)
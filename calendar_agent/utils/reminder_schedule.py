@@ -0,0 +1,225 @@
+import json
+import os
+import sqlite3
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ReminderWindows = List[Tuple[timedelta, str]]
+
+class ReminderSchedule:
+    """Every reminder a set of events will need, sorted by the time it should fire.
+
+    Built once per sync; a tick is then two bisects over [since, until) instead of a
+    pass over every event and window. Windows may differ per event via ``windows_for``.
+    """
+
+    def __init__(
+        self,
+        events: List[Dict[str, Any]],
+        reminder_windows: ReminderWindows,
+        windows_for: Optional[Callable[[Dict[str, Any]], ReminderWindows]] = None
+    ):
+        self.events: Dict[str, Dict[str, Any]] = {}
+        entries = []
+        for event in events:
+            try:
+                event_time = datetime.fromisoformat(event['start_time'])
+            except (ValueError, KeyError):
+                # Skip events with invalid dates
+                continue
+            if event["id"] in self.events:
+                continue
+            self.events[event["id"]] = event
+            for window, window_name in (windows_for(event) if windows_for else reminder_windows):
+                entries.append((event_time - window, event["id"], window_name))
+        self._set_entries(entries)
+
+    @classmethod
+    def from_entries(
+        cls,
+        events: Dict[str, Dict[str, Any]],
+        entries: List[Tuple[datetime, str, str]]
+    ) -> "ReminderSchedule":
+        schedule = cls.__new__(cls)
+        schedule.events = events
+        schedule._set_entries(entries)
+        return schedule
+
+    def _set_entries(self, entries: List[Tuple[datetime, str, str]]):
+        self.entries = sorted(entries)
+        self._fire_times = [fire_time for fire_time, _, _ in self.entries]
+
+    def due(self, since: datetime, until: datetime) -> List[Dict[str, Any]]:
+        """Reminders firing in [since, until) for events that haven't started by until"""
+        start = bisect_left(self._fire_times, since)
+        stop = bisect_left(self._fire_times, until)
+        due = [self._reminder(event_id, window_name, until) for _, event_id, window_name in self.entries[start:stop]]
+        return [reminder for reminder in due if reminder]
+
+    def reminders(self, reminder_keys: List[str], until: datetime) -> List[Dict[str, Any]]:
+        """The given reminders that fired before until, for events that haven't started by until"""
+        keys = set(reminder_keys)
+        found = [
+            self._reminder(event_id, window_name, until)
+            for fire_time, event_id, window_name in self.entries[:bisect_left(self._fire_times, until)]
+            if f"{event_id}_{window_name}" in keys
+        ]
+        return [reminder for reminder in found if reminder]
+
+    def _reminder(self, event_id: str, window_name: str, until: datetime) -> Optional[Dict[str, Any]]:
+        event = self.events[event_id]
+        if datetime.fromisoformat(event['start_time']) <= until:
+            return None
+        event_copy = event.copy()
+        event_copy['reminder_type'] = window_name
+        event_copy['reminder_key'] = f"{event_id}_{window_name}"
+        return event_copy
+
+    def next_fire_time(self, after: datetime) -> Optional[datetime]:
+        """The first fire time strictly after ``after``, if any"""
+        index = bisect_right(self._fire_times, after)
+        return self._fire_times[index] if index < len(self._fire_times) else None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+class ReminderScheduleStore:
+    """The latest ReminderSchedule and the time of the last reminder tick, kept in SQLite.
+
+    /api/sync writes the schedule and /api/remind reads it, usually from different
+    invocations; the decoded schedule is reused in-process until a newer one is saved.
+    """
+
+    def __init__(self, path: Path, retry_grace: timedelta, max_catchup: timedelta):
+        self.path = path
+        self.retry_grace = retry_grace
+        self.max_catchup = max_catchup
+        self._conn: Optional[sqlite3.Connection] = None
+        self._loaded: Optional[Tuple[str, ReminderSchedule]] = None
+
+    def save(self, schedule: ReminderSchedule):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM schedule_entries")
+                conn.execute("DELETE FROM schedule_events")
+                conn.executemany(
+                    "INSERT INTO schedule_events (event_id, event) VALUES (?, ?)",
+                    [(event_id, json.dumps(event)) for event_id, event in schedule.events.items()]
+                )
+                conn.executemany(
+                    "INSERT INTO schedule_entries (fire_at, event_id, reminder_type) VALUES (?, ?, ?)",
+                    [(fire_time.isoformat(), event_id, window_name)
+                     for fire_time, event_id, window_name in schedule.entries]
+                )
+                built_at = datetime.utcnow().isoformat()
+                conn.execute("INSERT OR REPLACE INTO schedule_state VALUES ('built_at', ?)", (built_at,))
+            self._loaded = (built_at, schedule)
+        except sqlite3.Error as e:
+            print(f"Reminder schedule write error: {e}")
+
+    def load(self) -> Optional[ReminderSchedule]:
+        """The last saved schedule, or None if no sync has built one yet"""
+        try:
+            conn = self._connect()
+            built_at = self._state(conn, "built_at")
+            if built_at is None:
+                return None
+            if self._loaded and self._loaded[0] == built_at:
+                return self._loaded[1]
+            events = {
+                event_id: json.loads(event)
+                for event_id, event in conn.execute("SELECT event_id, event FROM schedule_events")
+            }
+            entries = [
+                (datetime.fromisoformat(fire_at), event_id, reminder_type)
+                for fire_at, event_id, reminder_type in conn.execute(
+                    "SELECT fire_at, event_id, reminder_type FROM schedule_entries"
+                )
+            ]
+        except sqlite3.Error as e:
+            print(f"Reminder schedule read error: {e}")
+            return None
+        schedule = ReminderSchedule.from_entries(events, entries)
+        self._loaded = (built_at, schedule)
+        return schedule
+
+    def tick_start(self, now: datetime) -> datetime:
+        """Where this tick's window begins: the last tick (so a late cron misses nothing),
+        pulled back by the retry grace so reminders that failed on the last tick are
+        retried on this one, but no further than max_catchup"""
+        start = now
+        try:
+            last_tick = self._state(self._connect(), "last_tick")
+        except sqlite3.Error as e:
+            print(f"Reminder schedule read error: {e}")
+            last_tick = None
+        if last_tick is not None:
+            start = min(start, datetime.fromisoformat(last_tick))
+        return max(start - self.retry_grace, now - self.max_catchup)
+
+    def set_last_tick(self, now: datetime):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO schedule_state VALUES ('last_tick', ?)", (now.isoformat(),))
+        except sqlite3.Error as e:
+            print(f"Reminder schedule write error: {e}")
+
+    def pending_announcements(self) -> List[str]:
+        """Ids of new events whose announcement hasn't reached every subscriber yet"""
+        return self._list_state("pending_announcements")
+
+    def set_pending_announcements(self, event_ids: List[str]):
+        self._set_list_state("pending_announcements", event_ids)
+
+    def deferred_reminders(self) -> List[str]:
+        """Keys of reminders the last tick ran out of time or rate limit for"""
+        return self._list_state("deferred_reminders")
+
+    def set_deferred_reminders(self, reminder_keys: List[str]):
+        self._set_list_state("deferred_reminders", reminder_keys)
+
+    def _list_state(self, key: str) -> List[str]:
+        try:
+            value = self._state(self._connect(), key)
+        except sqlite3.Error as e:
+            print(f"Reminder schedule read error: {e}")
+            return []
+        return json.loads(value) if value else []
+
+    def _set_list_state(self, key: str, values: List[str]):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO schedule_state VALUES (?, ?)", (key, json.dumps(values)))
+        except sqlite3.Error as e:
+            print(f"Reminder schedule write error: {e}")
+
+    def _state(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM schedule_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path))
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS schedule_entries ("
+                "fire_at TEXT NOT NULL, event_id TEXT NOT NULL, reminder_type TEXT NOT NULL, "
+                "PRIMARY KEY (event_id, reminder_type))"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS schedule_events (event_id TEXT PRIMARY KEY, event TEXT NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS schedule_state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+reminder_schedule_store = ReminderScheduleStore(
+    Path(os.getenv("REMINDER_SCHEDULE_PATH", "/tmp/reminder_schedule.db")),
+    retry_grace=timedelta(minutes=int(os.getenv("REMINDER_RETRY_GRACE_MINUTES", "15"))),
+    max_catchup=timedelta(minutes=int(os.getenv("REMINDER_MAX_CATCHUP_MINUTES", "60")))
+)
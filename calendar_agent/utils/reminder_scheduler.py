@@ -0,0 +1,118 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from calendar_agent.utils.reminder_dispatch import ReminderDispatcher
+from calendar_agent.utils.reminder_schedule import ReminderScheduleStore
+
+_active_scheduler: Optional["ReminderScheduler"] = None
+
+def scheduler_enabled() -> bool:
+    return os.getenv("REMINDER_SCHEDULER", "false").lower() in ("1", "true", "yes")
+
+def notify_schedule_changed():
+    """Wake the in-process scheduler (if one is running) to re-plan against a new schedule"""
+    if _active_scheduler is not None:
+        _active_scheduler.replan()
+
+async def send_due_reminders(
+    dispatcher: ReminderDispatcher,
+    store: ReminderScheduleStore,
+    now: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """Send everything the saved schedule says fired since the last tick, plus what the
+    last tick deferred (however long ago it fired, until its event starts)"""
+    schedule = store.load()
+    if schedule is None:
+        return []
+    now = now or datetime.utcnow()
+    due = schedule.due(store.tick_start(now), now)
+    due_keys = {reminder["reminder_key"] for reminder in due}
+    due += [
+        reminder for reminder in schedule.reminders(store.deferred_reminders(), now)
+        if reminder["reminder_key"] not in due_keys
+    ]
+    reminders_sent = await dispatcher.dispatch(due)
+    store.set_deferred_reminders(dispatcher.deferred_keys)
+    store.set_last_tick(now)
+    return reminders_sent
+
+class ReminderScheduler:
+    """Long-running alternative to polling /api/remind from cron.
+
+    Sleeps until the next fire time in the saved ReminderSchedule, sends what is due,
+    and plans again. A sync in this process wakes it early (notify_schedule_changed);
+    one written by another process is picked up within ``max_sleep``. When given a
+    ``sync`` coroutine it also re-syncs every ``sync_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        store: ReminderScheduleStore,
+        make_dispatcher: Callable[[], ReminderDispatcher],
+        sync: Optional[Callable[[], Awaitable[Any]]] = None,
+        sync_interval: Optional[float] = None,
+        max_sleep: Optional[float] = None
+    ):
+        self.store = store
+        self.make_dispatcher = make_dispatcher
+        self.sync = sync
+        self.sync_interval = sync_interval or float(os.getenv("REMINDER_SCHEDULER_SYNC_INTERVAL", str(6 * 3600)))
+        self.max_sleep = max_sleep or float(os.getenv("REMINDER_SCHEDULER_MAX_SLEEP", "900"))
+        self._replan = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._next_sync = 0.0
+
+    def start(self):
+        global _active_scheduler
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            _active_scheduler = self
+
+    async def stop(self):
+        global _active_scheduler
+        if _active_scheduler is self:
+            _active_scheduler = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def replan(self):
+        self._replan.set()
+
+    async def _run(self):
+        while True:
+            # Cleared before reading the schedule so a sync during this pass still wakes us
+            self._replan.clear()
+            try:
+                await self._tick()
+            except Exception as e:
+                print(f"Reminder scheduler error: {e}")
+            try:
+                await asyncio.wait_for(self._replan.wait(), timeout=self._sleep_seconds())
+            except asyncio.TimeoutError:
+                pass
+
+    async def _tick(self):
+        if self.sync and time.monotonic() >= self._next_sync:
+            self._next_sync = time.monotonic() + self.sync_interval
+            await self.sync()
+        reminders_sent = await send_due_reminders(self.make_dispatcher(), self.store)
+        if reminders_sent:
+            print(f"Reminder scheduler sent {len(reminders_sent)} reminder(s)")
+
+    def _sleep_seconds(self) -> float:
+        delay = self.max_sleep
+        if self.sync:
+            delay = min(delay, self._next_sync - time.monotonic())
+        schedule = self.store.load()
+        next_fire = schedule.next_fire_time(datetime.utcnow()) if schedule else None
+        if next_fire is not None:
+            delay = min(delay, (next_fire - datetime.utcnow()).total_seconds())
+        # Never spin; a fire time that just passed is picked up on the next pass
+        return max(delay, 1.0)
@@ -1,70 +1,187 @@
 import os
-from datetime import datetime, timedelta
-from typing import Dict, Set
+import sqlite3
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Optional
+
+# Per-recipient delivery keys are "<message key>|<phone>" (see fanout.py)
+RECIPIENT_SEPARATOR = "|"
+# Announcement keys share the table with reminders but aren't reminders
+ANNOUNCEMENT_SUFFIX = "_announcement"
+
+def recipient_key(delivery_key: str, phone: str) -> str:
+    return f"{delivery_key}{RECIPIENT_SEPARATOR}{phone}"
 
 class ReminderTracker:
-    """Simple file-based reminder tracking to avoid sending duplicate reminders"""
-    
-    def __init__(self):
-        # Use a simple file in temp directory for tracking
-        self.tracking_file = Path("/tmp/reminder_tracking.txt")
-        self._sent_reminders: Set[str] = set()
-        self._load_tracking()
-    
-    def _load_tracking(self):
-        """Load previously sent reminders from file"""
-        try:
-            if self.tracking_file.exists():
-                with open(self.tracking_file, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and '|' in line:
-                            reminder_key, timestamp_str = line.split('|', 1)
-                            # Only keep reminders from last 7 days
-                            try:
-                                timestamp = datetime.fromisoformat(timestamp_str)
-                                if datetime.utcnow() - timestamp < timedelta(days=7):
-                                    self._sent_reminders.add(reminder_key)
-                            except:
-                                continue
-        except Exception:
-            # If file doesn't exist or is corrupted, start fresh
-            self._sent_reminders = set()
-    
-    def _save_tracking(self):
-        """Save current tracking state to file"""
-        try:
-            # Create directory if it doesn't exist
-            self.tracking_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(self.tracking_file, 'w') as f:
-                current_time = datetime.utcnow().isoformat()
-                for reminder_key in self._sent_reminders:
-                    f.write(f"{reminder_key}|{current_time}\n")
-        except Exception:
-            # If we can't save, continue without crashing
-            pass
-    
+    """SQLite-backed record of sent reminders, used to avoid sending duplicates.
+
+    Each key is stored once with the time it was first sent; keys older than the
+    retention window are range-deleted through the sent_at index.
+
+    Senders that may overlap (cron runs, a slow run and the next tick) should go
+    through claim_reminder -> send -> commit_reminder / release_reminder: a claim is
+    a lease held by one caller until it commits, releases or the lease expires.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        retention: timedelta = timedelta(days=7),
+        lease: Optional[timedelta] = None
+    ):
+        self.path = path or Path(os.getenv("REMINDER_TRACKING_PATH", "/tmp/reminder_tracking.db"))
+        self.retention = retention
+        if lease is None:
+            lease = timedelta(seconds=float(os.getenv("REMINDER_CLAIM_LEASE", "300")))
+        self.lease = lease
+        self._conn: Optional[sqlite3.Connection] = None
+
     def is_reminder_sent(self, reminder_key: str) -> bool:
         """Check if a reminder has already been sent"""
-        return reminder_key in self._sent_reminders
-    
+        try:
+            row = self._connect().execute(
+                "SELECT 1 FROM sent_reminders WHERE reminder_key = ?", (reminder_key,)
+            ).fetchone()
+            return row is not None
+        except sqlite3.Error as e:
+            print(f"Reminder tracking read error: {e}")
+            return False
+
     def mark_reminder_sent(self, reminder_key: str) -> bool:
-        """Mark a reminder as sent"""
+        """Mark a reminder as sent; the first send time of a key is kept"""
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR IGNORE INTO sent_reminders (reminder_key, sent_at) VALUES (?, ?)",
+                (reminder_key, time.time())
+            )
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Reminder tracking write error: {e}")
+            return False
+
+    def claim_reminder(self, reminder_key: str) -> Optional[str]:
+        """Take the lease on a reminder that hasn't been sent; returns a claim token, or None
+        if it was already sent or another caller holds a live claim"""
+        token = uuid.uuid4().hex
+        now = time.time()
         try:
-            self._sent_reminders.add(reminder_key)
-            self._save_tracking()
+            conn = self._connect()
+            with conn:
+                # One write transaction: SQLite's file lock serializes claimers across processes
+                conn.execute(
+                    "DELETE FROM reminder_claims WHERE reminder_key = ? AND expires_at <= ?",
+                    (reminder_key, now)
+                )
+                claimed = conn.execute(
+                    "INSERT OR IGNORE INTO reminder_claims (reminder_key, token, expires_at) "
+                    "SELECT ?, ?, ? WHERE NOT EXISTS "
+                    "(SELECT 1 FROM sent_reminders WHERE reminder_key = ?)",
+                    (reminder_key, token, now + self.lease.total_seconds(), reminder_key)
+                ).rowcount
+            return token if claimed else None
+        except sqlite3.Error as e:
+            # Not sending is the safe side of a duplicate
+            print(f"Reminder claim error: {e}")
+            return None
+
+    def commit_reminder(self, reminder_key: str, token: str) -> bool:
+        """Record a claimed reminder as sent and drop the claim"""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO sent_reminders (reminder_key, sent_at) VALUES (?, ?)",
+                    (reminder_key, time.time())
+                )
+                conn.execute(
+                    "DELETE FROM reminder_claims WHERE reminder_key = ? AND token = ?",
+                    (reminder_key, token)
+                )
+            return True
+        except sqlite3.Error as e:
+            print(f"Reminder tracking write error: {e}")
+            return False
+
+    def release_reminder(self, reminder_key: str, token: str) -> bool:
+        """Give up a claim without sending, so a later run can retry the reminder"""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "DELETE FROM reminder_claims WHERE reminder_key = ? AND token = ?",
+                    (reminder_key, token)
+                )
             return True
-        except Exception:
+        except sqlite3.Error as e:
+            print(f"Reminder claim release error: {e}")
             return False
-    
-    def get_reminders_sent_count(self, since: datetime = None) -> int:
-        """Get count of reminders sent (simplified - returns total)"""
-        return len(self._sent_reminders)
-    
-    def cleanup_old_reminders(self):
-        """Remove old reminder tracking (older than 7 days)"""
-        # This is handled automatically in _load_tracking
-        self._load_tracking()
-        self._save_tracking()
\ No newline at end of file
+
+    def get_reminders_sent_count(self, since: Optional[datetime] = None) -> int:
+        """Count of reminders sent, optionally only those sent at or after since (naive = UTC).
+
+        Each reminder counts once however many subscribers got it: per-recipient
+        delivery keys and announcements are left out.
+        """
+        query = (
+            "SELECT COUNT(*) FROM sent_reminders "
+            "WHERE instr(reminder_key, ?) = 0 AND substr(reminder_key, -?) != ?"
+        )
+        params = [RECIPIENT_SEPARATOR, len(ANNOUNCEMENT_SUFFIX), ANNOUNCEMENT_SUFFIX]
+        if since is not None:
+            query += " AND sent_at >= ?"
+            params.append(_timestamp(since))
+        try:
+            row = self._connect().execute(query, params).fetchone()
+            return row[0]
+        except sqlite3.Error as e:
+            print(f"Reminder tracking read error: {e}")
+            return 0
+
+    def cleanup_old_reminders(self) -> int:
+        """Remove reminders sent before the retention window; returns rows removed"""
+        try:
+            conn = self._connect()
+            removed = self._expire(conn)
+            conn.commit()
+            return removed
+        except sqlite3.Error as e:
+            print(f"Reminder tracking cleanup error: {e}")
+            return 0
+
+    def _expire(self, conn: sqlite3.Connection) -> int:
+        now = time.time()
+        conn.execute("DELETE FROM reminder_claims WHERE expires_at <= ?", (now,))
+        cutoff = now - self.retention.total_seconds()
+        return conn.execute("DELETE FROM sent_reminders WHERE sent_at < ?", (cutoff,)).rowcount
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path))
+            # WAL lets concurrent invocations read while one of them records a send
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sent_reminders ("
+                "reminder_key TEXT PRIMARY KEY, sent_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sent_reminders_sent_at ON sent_reminders (sent_at)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS reminder_claims ("
+                "reminder_key TEXT PRIMARY KEY, token TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            # Expire once per process rather than on every write
+            self._expire(conn)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+def _timestamp(moment: datetime) -> float:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+reminder_tracker = ReminderTracker()
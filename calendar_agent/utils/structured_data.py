@@ -0,0 +1,152 @@
+import json
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+LUMA_BASE_URL = "https://lu.ma"
+
+NEXT_DATA_SCRIPT = re.compile(
+    r'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+JSON_LD_SCRIPT = re.compile(
+    r'<script[^>]*\btype=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+
+def find_embedded_payloads(html: str) -> List[Any]:
+    """Decode the __NEXT_DATA__ and JSON-LD script blocks of a page (no DOM is built)"""
+    payloads = []
+    for pattern in (NEXT_DATA_SCRIPT, JSON_LD_SCRIPT):
+        for match in pattern.finditer(html):
+            try:
+                payloads.append(json.loads(match.group(1)))
+            except ValueError:
+                continue
+    return payloads
+
+def events_from_payloads(payloads: List[Any]) -> List[Dict[str, Any]]:
+    """Events found anywhere in decoded JSON payloads, deduplicated by link.
+
+    Each event has api_id (Luma's "evt-" id, None for schema.org events), title, link,
+    start_at (aware UTC datetime), timezone, description and location. Returns an empty list when no payload holds one.
+    """
+    events: Dict[str, Dict[str, Any]] = {}
+    for payload in payloads:
+        for node in _walk(payload):
+            event = _from_luma_event(node) or _from_json_ld_event(node)
+            if event and event["link"] not in events:
+                events[event["link"]] = event
+    return list(events.values())
+
+def find_next_cursor(payloads: List[Any]) -> Optional[str]:
+    """Cursor of the next page from Luma's {"has_more": true, "next_cursor": ...} blocks"""
+    for payload in payloads:
+        for node in _walk(payload):
+            if node.get("has_more") and isinstance(node.get("next_cursor"), str):
+                return node["next_cursor"]
+    return None
+
+def find_api_id(payloads: List[Any], prefixes: Tuple[str, ...]) -> Optional[str]:
+    """First Luma api_id in the payloads with one of the given prefixes (e.g. "cal-")"""
+    for payload in payloads:
+        for node in _walk(payload):
+            api_id = node.get("api_id")
+            if isinstance(api_id, str) and api_id.startswith(prefixes):
+                return api_id
+    return None
+
+def _walk(payload: Any) -> Iterator[Dict[str, Any]]:
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            yield node
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            continue
+        # Reversed so nodes come off the stack in document order
+        stack.extend(reversed([value for value in children if isinstance(value, (dict, list))]))
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def _absolute_link(url: str) -> str:
+    if url.startswith('http'):
+        return url
+    return f"{LUMA_BASE_URL}/{url.lstrip('/')}"
+
+def _text(value: Any) -> str:
+    return value.strip() if isinstance(value, str) else ""
+
+def _from_luma_event(node: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Luma's own event objects: {"api_id": "evt-...", "name", "start_at", "url", ...}"""
+    api_id = node.get("api_id")
+    if not (isinstance(api_id, str) and api_id.startswith("evt-")):
+        return None
+    start_at = _parse_timestamp(node.get("start_at"))
+    title = _text(node.get("name"))
+    if not title or not start_at:
+        return None
+
+    geo = node.get("geo_address_info") or {}
+    location = ""
+    if isinstance(geo, dict):
+        location = _text(geo.get("full_address")) or _text(geo.get("address")) or _text(geo.get("city_state"))
+
+    return {
+        "api_id": api_id,
+        "title": title,
+        "link": _absolute_link(_text(node.get("url")) or f"event/{api_id}"),
+        "start_at": start_at,
+        "timezone": _text(node.get("timezone")) or None,
+        "description": _text(node.get("description")) or _text(node.get("description_short")),
+        "location": location
+    }
+
+def _from_json_ld_event(node: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """schema.org events: {"@type": "Event", "name", "startDate", "url", "location", ...}"""
+    types = node.get("@type")
+    types = types if isinstance(types, list) else [types]
+    if not any(isinstance(t, str) and t.endswith("Event") for t in types):
+        return None
+    start_at = _parse_timestamp(node.get("startDate"))
+    title = _text(node.get("name"))
+    link = _text(node.get("url")) or _text(node.get("@id"))
+    if not title or not start_at or not link:
+        return None
+
+    location = ""
+    place = node.get("location")
+    if isinstance(place, list):
+        place = place[0] if place else None
+    if isinstance(place, dict):
+        address = place.get("address")
+        if isinstance(address, dict):
+            address = ", ".join(
+                _text(address.get(key))
+                for key in ("streetAddress", "addressLocality", "addressRegion")
+                if _text(address.get(key))
+            )
+        location = _text(place.get("name")) or _text(address)
+    elif isinstance(place, str):
+        location = place.strip()
+
+    return {
+        "title": title,
+        "link": _absolute_link(link),
+        "start_at": start_at,
+        "timezone": None,
+        "description": _text(node.get("description")),
+        "location": location
+    }
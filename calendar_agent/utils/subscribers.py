@@ -0,0 +1,93 @@
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+E164 = re.compile(r"^\+[1-9]\d{7,14}$")
+
+def normalize_phone(phone: str) -> str:
+    """E.164 form of a phone number ("(305) 555-0100" -> "+13055550100"); raises ValueError.
+
+    Numbers without a country code get SUBSCRIBER_COUNTRY_CODE (default 1, US/Canada).
+    """
+    digits = re.sub(r"[\s().-]", "", phone or "")
+    if digits.startswith("00"):
+        digits = "+" + digits[2:]
+    if not digits.startswith("+"):
+        country_code = os.getenv("SUBSCRIBER_COUNTRY_CODE", "1")
+        # A national number, or one already carrying the default country code without "+"
+        if not (country_code == "1" and len(digits) == 11 and digits.startswith("1")):
+            digits = country_code + digits
+        digits = "+" + digits
+    if not E164.match(digits):
+        raise ValueError(f"not a valid phone number: {phone!r}")
+    return digits
+
+def default_recipients() -> List[str]:
+    """Numbers used while the registry is empty: SUBSCRIBER_NUMBERS, else SMS_TO_NUMBER"""
+    numbers = [n.strip() for n in os.getenv("SUBSCRIBER_NUMBERS", "").split(",") if n.strip()]
+    return numbers or [os.getenv("SMS_TO_NUMBER", "+12098128451")]
+
+class SubscriberRegistry:
+    """Phone numbers that receive reminders, announcements and digests (SQLite)"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def add(self, phone: str, name: str = "") -> bool:
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO subscribers (phone, name, created_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (phone) DO UPDATE SET name = excluded.name",
+                (phone, name, time.time())
+            )
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Subscriber registry write error: {e}")
+            return False
+
+    def remove(self, phone: str) -> bool:
+        """Unsubscribe a number; returns whether it was subscribed"""
+        try:
+            conn = self._connect()
+            removed = conn.execute("DELETE FROM subscribers WHERE phone = ?", (phone,)).rowcount
+            conn.commit()
+            return removed > 0
+        except sqlite3.Error as e:
+            print(f"Subscriber registry write error: {e}")
+            return False
+
+    def list(self) -> List[Dict[str, Any]]:
+        try:
+            rows = self._connect().execute(
+                "SELECT phone, name, created_at FROM subscribers ORDER BY created_at"
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Subscriber registry read error: {e}")
+            return []
+        return [{"phone": phone, "name": name, "subscribed_at": created_at} for phone, name, created_at in rows]
+
+    def recipients(self) -> List[str]:
+        """Every subscribed number, or the configured default numbers if there are none"""
+        return [subscriber["phone"] for subscriber in self.list()] or default_recipients()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path))
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS subscribers ("
+                "phone TEXT PRIMARY KEY, name TEXT NOT NULL DEFAULT '', created_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+subscriber_registry = SubscriberRegistry(
+    Path(os.getenv("SUBSCRIBERS_PATH", "/tmp/subscribers.db"))
+)
@@ -1,14 +1,29 @@
-import httpx
-from typing import Dict, Any, Optional
-from calendar_agent.utils.ai_summarizer import AISummarizer
+from typing import TYPE_CHECKING, Dict, Any, Optional
+from calendar_agent.utils import deadline
+from calendar_agent.utils.ai_summarizer import AISummarizer, MessageGenerator
+from calendar_agent.utils.metrics import sms_quota_remaining, sms_request_seconds, sms_sent
+
+if TYPE_CHECKING:
+    import httpx
 
 class TextBeltSMSClient:
-    def __init__(self, api_key: str, to_number: str = "+12098128451"):
+    def __init__(
+        self,
+        api_key: str,
+        to_number: str = "+12098128451",
+        client: Optional["httpx.AsyncClient"] = None,
+        ai_summarizer: Optional[AISummarizer] = None
+    ):
         self.api_key = api_key
         self.to_number = to_number
         self.base_url = "https://textbelt.com/text"
-        self.client = httpx.AsyncClient(timeout=30.0)
-        self.ai_summarizer = AISummarizer()
+        # A shared client belongs to whoever passed it in; only close our own
+        self._owns_client = client is None
+        if client is None:
+            import httpx
+            client = httpx.AsyncClient(timeout=30.0)
+        self.client = client
+        self.ai_summarizer = ai_summarizer or AISummarizer()
     
     async def send_sms(self, message: str, phone: Optional[str] = None) -> Dict[str, Any]:
         try:
@@ -18,6 +33,14 @@ class TextBeltSMSClient:
                     "error": "Missing TextBelt API key"
                 }
             
+            # Don't start a send the invocation may be killed in the middle of
+            if not deadline.has_time(deadline.SEND_MINIMUM):
+                return {
+                    "success": False,
+                    "deferred": True,
+                    "error": "Deferred: request time budget exhausted"
+                }
+            
             # Use provided phone or default
             recipient = phone or self.to_number
             
@@ -31,15 +54,20 @@ class TextBeltSMSClient:
                 "key": self.api_key
             }
             
-            response = await self.client.post(
-                self.base_url,
-                data=data
-            )
+            with sms_request_seconds.time():
+                response = await self.client.post(
+                    self.base_url,
+                    data=data,
+                    timeout=deadline.timeout_for(30.0)
+                )
             
             if response.status_code == 200:
                 result = response.json()
+                if result.get("quotaRemaining") is not None:
+                    sms_quota_remaining.set(result["quotaRemaining"])
                 
                 if result.get("success"):
+                    sms_sent.inc(outcome="sent")
                     return {
                         "success": True,
                         "message_id": result.get("textId"),
@@ -48,17 +76,28 @@ class TextBeltSMSClient:
                         "service": "TextBelt"
                     }
                 else:
+                    sms_sent.inc(outcome="rejected")
                     return {
                         "success": False,
                         "error": result.get("error", "Unknown TextBelt error"),
                         "quota_remaining": result.get("quotaRemaining")
                     }
             else:
+                sms_sent.inc(outcome="http_error")
                 return {
                     "success": False,
                     "error": f"HTTP {response.status_code}: {response.text}"
                 }
+        except deadline.DeadlineExceeded as e:
+            # Ran out of time waiting to send (rate limit); nothing went out, so retry next tick
+            sms_sent.inc(outcome="deferred")
+            return {
+                "success": False,
+                "deferred": True,
+                "error": f"Deferred: {e}"
+            }
         except Exception as e:
+            sms_sent.inc(outcome="error")
             return {
                 "success": False,
                 "error": str(e)
@@ -67,21 +106,28 @@ class TextBeltSMSClient:
     async def send_ai_reminder(self, event: Dict[str, Any], reminder_type: str) -> Dict[str, Any]:
         try:
             message_generator = await self.ai_summarizer.generate_reminder_message(event, reminder_type)
-            
-            # Optimize message for SMS
-            message = self._optimize_for_sms(message_generator.content)
-            
-            result = await self.send_sms(message)
-            result["ai_generated"] = True
-            result["tokens_used"] = message_generator.tokens_used
-            result["model"] = message_generator.model
-            return result
+            return await self.send_generated_message(message_generator)
         except Exception as e:
             return {
                 "success": False,
                 "error": f"Failed to generate AI message: {str(e)}"
             }
     
+    async def send_generated_message(
+        self,
+        message_generator: MessageGenerator,
+        phone: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Send an already generated AI message, annotated with how it was generated"""
+        # Optimize message for SMS
+        message = self._optimize_for_sms(message_generator.content)
+        
+        result = await self.send_sms(message, phone)
+        result["ai_generated"] = True
+        result["tokens_used"] = message_generator.tokens_used
+        result["model"] = message_generator.model
+        return result
+    
     async def send_ai_announcement(self, event: Dict[str, Any]) -> Dict[str, Any]:
         try:
             message_generator = await self.ai_summarizer.generate_new_event_announcement(event)
@@ -189,4 +235,5 @@ class TextBeltSMSClient:
             }
     
     async def close(self):
-        await self.client.aclose()
\ No newline at end of file
+        if self._owns_client:
+            await self.client.aclose()
\ No newline at end of file